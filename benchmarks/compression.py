@@ -0,0 +1,43 @@
+"""File size, save and load time of each storage format with every available codec.
+
+Run from the repository root:
+
+    python -m benchmarks.compression --contacts 50000 --formats pkl json jsonl
+"""
+
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+from benchmarks.parallel_load import build_book, timed
+from storage.factory import StorageFactory
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=50_000)
+    parser.add_argument("--formats", nargs="+", default=["pkl", "json", "jsonl"])
+    args = parser.parse_args()
+
+    repository = build_book(args.contacts)
+    codecs = [""] + StorageFactory.get_compression_codecs()
+    base_path = Path(tempfile.mkdtemp(prefix="addressbook-bench-"))
+    try:
+        print(f"{args.contacts} contacts")
+        print(f"{'storage':<10}  {'size, KB':>9}  {'save, s':>8}  {'load, s':>8}")
+        for storage_format in args.formats:
+            for codec in codecs:
+                storage_type = f"{storage_format}.{codec}" if codec else storage_format
+                storage = StorageFactory.create_storage(storage_type, base_path, backups=0)
+                save_time, _ = timed(lambda: storage.save(repository))
+                load_time, loaded = timed(storage.load)
+                assert len(loaded.contacts) == args.contacts
+                size = storage.file_path.stat().st_size // 1024
+                print(f"{storage_type:<10}  {size:>9}  {save_time:>8.3f}  {load_time:>8.3f}")
+    finally:
+        shutil.rmtree(base_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Startup and save time of the sharded storage against the number of worker processes.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel_load --contacts 100000 --processes 0 1 2 4 8
+
+0 processes is the in-process thread pool baseline.
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from models.contact import Record
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+from storage.factory import StorageFactory
+
+
+def build_book(size: int) -> ContactRepository:
+    repository = ContactRepository()
+    for i in range(size):
+        record = Record(f"Contact {i}")
+        record.add_phone(f"{i % 10**10:010d}")
+        record.add_email(f"contact{i}@example.com")
+        record.set_address(f"{i} Main Street")
+        record.set_birthday(f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.1990")
+        repository.add_contact(record)
+    for i in range(size // 100):
+        repository.add_note(Note(f"Note {i}", ["bench"]))
+    return repository
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--processes", type=int, nargs="+", default=[0, 1, 2, 4])
+    args = parser.parse_args()
+
+    repository = build_book(args.contacts)
+    base_path = Path(tempfile.mkdtemp(prefix="addressbook-bench-"))
+    try:
+        print(f"{args.contacts} contacts, {args.shards} shards")
+        print(f"{'processes':>9}  {'save, s':>8}  {'load, s':>8}")
+        for processes in args.processes:
+            storage = StorageFactory.create_storage(
+                "shards", base_path, shards=args.shards, processes=processes, backups=0
+            )
+            save_time, _ = timed(lambda: storage.save(repository))
+            load_time, loaded = timed(storage.load)
+            assert len(loaded.contacts) == args.contacts
+            print(f"{processes:>9}  {save_time:>8.3f}  {load_time:>8.3f}")
+    finally:
+        shutil.rmtree(base_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Rows per second of the contact and birthday tables: one print per line against one write per page.
+
+Output goes to os.devnull through the same colorama wrapper main installs,
+set up as for a terminal (escapes passed through) or a pipe (escapes
+stripped). Run from the repository root:
+
+    python -m benchmarks.terminal_output --contacts 50000
+"""
+
+import argparse
+import contextlib
+import os
+
+from colorama import AnsiToWin32, Fore, Style
+
+from benchmarks.parallel_load import build_book, timed
+from cli.presenter import Presenter
+from handlers.birthday_service import BirthdayService
+
+
+def print_contacts_per_line(contacts):
+    """The table as it was printed before rows were rendered from templates."""
+    print(f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Contact Information':<90}{Style.RESET_ALL}")
+    print(f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
+    for idx, contact in enumerate(contacts, 1):
+        phones = "; ".join(p.value for p in contact.phones) if contact.phones else "-"
+        emails = "; ".join(e.value for e in contact.emails) if contact.emails else "-"
+        address = contact.address.value if contact.address else "-"
+        birthday = str(contact.birthday) if contact.birthday else "-"
+        print(f"{Fore.YELLOW}{idx:<4}{Style.RESET_ALL} {Fore.MAGENTA}{contact.name.value:<20}{Style.RESET_ALL}")
+        print(f"{'':26}{Fore.CYAN}Phones:{Style.RESET_ALL}   {Fore.GREEN}{phones}{Style.RESET_ALL}")
+        print(f"{'':26}{Fore.CYAN}Emails:{Style.RESET_ALL}   {Fore.GREEN}{emails}{Style.RESET_ALL}")
+        print(f"{'':26}{Fore.CYAN}Address:{Style.RESET_ALL}  {Fore.GREEN}{address}{Style.RESET_ALL}")
+        print(f"{'':26}{Fore.CYAN}Birthday:{Style.RESET_ALL} {Fore.GREEN}{birthday}{Style.RESET_ALL}")
+        print(f"{Fore.BLUE}{'-' * 120}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Total contacts: {len(contacts)}{Style.RESET_ALL}\n")
+
+
+def print_birthdays_per_line(results):
+    """The birthday table as it was printed before, without the statistics line."""
+    print(f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Birthday Information':<90}{Style.RESET_ALL}")
+    print(f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
+    for idx, result in enumerate(results, 1):
+        is_shifted = result["is_shifted"]
+        jubilee = " (Jubilee)" if result["is_jubilee"] else ""
+        date_display = f"{result['weekday']} {result['date']}"
+        birthday_display = (
+            f"{result['actual_birthday_weekday']} {result['actual_birthday_date']}" if is_shifted else date_display
+        )
+        print(f"{Fore.YELLOW}{idx:<4}{Style.RESET_ALL} {Fore.MAGENTA}{result['name']:<20}{Style.RESET_ALL}")
+        print(f"{'':26}{Fore.CYAN}Age:{Style.RESET_ALL}        {Fore.GREEN}{result['age']} years{jubilee}{Style.RESET_ALL}")
+        print(f"{'':26}{Fore.CYAN}Birthday:{Style.RESET_ALL}   {Fore.GREEN}{birthday_display}{Style.RESET_ALL}")
+        if is_shifted:
+            print(
+                f"{'':26}{Fore.CYAN}Congratulate:{Style.RESET_ALL} {Fore.GREEN}{date_display} (shifted from {result['shift_reason']}){Style.RESET_ALL}"
+            )
+        print(f"{'':26}{Fore.CYAN}Phone:{Style.RESET_ALL}      {Fore.GREEN}{result['phone'] or '-'}{Style.RESET_ALL}")
+        print(f"{'':26}{Fore.CYAN}Email:{Style.RESET_ALL}      {Fore.GREEN}{result['email'] or '-'}{Style.RESET_ALL}")
+        print(f"{Fore.BLUE}{'-' * 120}{Style.RESET_ALL}")
+
+
+def rows_per_second(func, rows, strip):
+    with open(os.devnull, "w") as devnull:
+        stream = AnsiToWin32(devnull, strip=strip, convert=False, autoreset=True).stream
+        with contextlib.redirect_stdout(stream):
+            elapsed, _ = timed(func)
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    repository = build_book(args.contacts)
+    contacts = repository.get_all_contacts()
+    birthdays = BirthdayService(repository).find_near(args.days)
+    Presenter.page_size = 0
+
+    print(f"{args.contacts} contacts, {len(birthdays)} birthdays in {args.days} days")
+    print(f"{'table':<10}  {'output':<8}  {'per line, rows/s':>16}  {'per page, rows/s':>16}")
+    for output, strip in (("terminal", False), ("pipe", True)):
+        # Colour stays on for a terminal; main switches it off when stdout is a pipe
+        Presenter.set_color(not strip)
+        tables = (
+            ("contacts", len(contacts), lambda: print_contacts_per_line(contacts),
+             lambda: Presenter.print_contacts_table(contacts)),
+            ("birthdays", len(birthdays), lambda: print_birthdays_per_line(birthdays),
+             lambda: Presenter.print_birthdays_table(birthdays, args.days)),
+        )
+        for table, rows, before, after in tables:
+            before_rate = rows_per_second(before, rows, strip)
+            after_rate = rows_per_second(after, rows, strip)
+            print(f"{table:<10}  {output:<8}  {before_rate:>16,.0f}  {after_rate:>16,.0f}")
+    Presenter.set_color(True)
+
+
+if __name__ == "__main__":
+    main()
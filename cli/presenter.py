@@ -1,6 +1,9 @@
 """Presenter for handling all user-facing output with colorama and Rich"""
 
-from colorama import Fore, Style, init
+import sys
+from itertools import islice
+
+from colorama import Fore, Style, deinit, init
 from rich.console import Console
 from rich.panel import Panel
 
@@ -10,9 +13,69 @@ from .table_renderer import TableRenderer
 init(autoreset=True)
 
 
+# Marks the end of the rows in Presenter.pages
+_END = object()
+# Rows rendered into one write when listings are not paged
+_CHUNK_ROWS = 256
+
+
+class _Palette:
+    """Colour escapes of the tables, joined into row templates once instead of on every row"""
+
+    def __init__(self, enabled: bool) -> None:
+        def codes(*parts: str) -> str:
+            return "".join(parts) if enabled else ""
+
+        reset = codes(Style.RESET_ALL)
+        rule = f"{codes(Fore.BLUE, Style.BRIGHT)}{'=' * 120}{reset}"
+        title = codes(Fore.CYAN, Style.BRIGHT)
+        label = codes(Fore.CYAN)
+        value = codes(Fore.GREEN)
+
+        def field(name: str, padding: str, placeholder: str = "{}") -> str:
+            return f"{'':26}{label}{name}:{reset}{padding}{value}{placeholder}{reset}\n"
+
+        heading = f"{codes(Fore.YELLOW)}{{:<4}}{reset} {codes(Fore.MAGENTA)}{{:<20}}{reset}\n"
+        separator = f"{codes(Fore.BLUE)}{'-' * 120}{reset}\n"
+
+        self.footer = f"{label}{{}}{reset}\n\n"
+        self.contacts_header = (
+            f"\n{rule}\n{title}{'#':<4} {'Name':<20} {'Contact Information':<90}{reset}\n{rule}\n"
+        )
+        self.contact_row = (
+            heading
+            + field("Phones", "   ")
+            + field("Emails", "   ")
+            + field("Address", "  ")
+            + field("Birthday", " ")
+            + separator
+        )
+        self.birthdays_header = (
+            f"\n{rule}\n{title}{'#':<4} {'Name':<20} {'Birthday Information':<90}{reset}\n{rule}\n"
+        )
+        birthday_fields = heading + field("Age", "        ") + field("Birthday", "   ")
+        contact_fields = field("Phone", "      ") + field("Email", "      ") + separator
+        self.birthday_row = birthday_fields + contact_fields
+        self.shifted_birthday_row = (
+            birthday_fields + field("Congratulate", " ", "{} (shifted from {})") + contact_fields
+        )
+
+
 class Presenter:
     """Handles all user-facing output with colorama colors"""
 
+    # Rows shown before listings wait for the user; 0 prints everything at once
+    page_size = 0
+    _palette = _Palette(True)
+
+    @staticmethod
+    def set_color(enabled: bool):
+        """Turn colours on or off; main turns them off when stdout is not a terminal"""
+        Presenter._palette = _Palette(enabled)
+        # Strip the escapes of the other messages too
+        deinit()
+        init(autoreset=True, strip=None if enabled else True)
+
     @staticmethod
     def success(message: str) -> str:
         """Format success message in green"""
@@ -74,40 +137,80 @@ class Presenter:
         print(Presenter.header(message))
 
     @staticmethod
-    def print_contacts_table(contacts):
-        """Print contacts in a formatted table with colors"""
-        if not contacts:
-            print(Presenter.info("No contacts stored."))
-            return
+    def pages(rows, page_size=None):
+        """Yield rows in lists of page_size, waiting for the user between pages.
+
+        Without a page size the rows come in chunks of _CHUNK_ROWS and
+        nobody is asked, so a generator is still printed as it is produced.
+        Answering q (or closing the input) stops the listing.
+        """
+        if page_size is None:
+            page_size = Presenter.page_size
+        size = page_size or _CHUNK_ROWS
+        rows = iter(rows)
+        shown = 0
+        row = next(rows, _END)
+        while row is not _END:
+            page = [row]
+            page.extend(islice(rows, size - 1))
+            yield page
+            shown += len(page)
+            row = next(rows, _END)
+            if page_size and row is not _END:
+                try:
+                    answer = input(Presenter.format_hint(f"-- {shown} shown, Enter for more, q to stop -- "))
+                except EOFError:
+                    return
+                if answer.strip().lower() == "q":
+                    return
 
-        # Header
-        print(f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Contact Information':<90}{Style.RESET_ALL}")
-        print(f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
-
-        # Print each contact
-        for idx, contact in enumerate(contacts, 1):
-            # Get all phones in one line
-            phones = "; ".join(p.value for p in contact.phones) if contact.phones else "-"
-
-            # Get all emails in one line
-            emails = "; ".join(e.value for e in contact.emails) if contact.emails else "-"
-
-            # Get address
-            address = contact.address.value if contact.address else "-"
-
-            # Get birthday
-            birthday = str(contact.birthday) if contact.birthday else "-"
+    @staticmethod
+    def paginate(rows, page_size=None):
+        """Yield rows one by one, waiting for the user after every page_size of them"""
+        for page in Presenter.pages(rows, page_size):
+            yield from page
 
-            # Print contact info
-            print(f"{Fore.YELLOW}{idx:<4}{Style.RESET_ALL} {Fore.MAGENTA}{contact.name.value:<20}{Style.RESET_ALL}")
-            print(f"{'':26}{Fore.CYAN}Phones:{Style.RESET_ALL}   {Fore.GREEN}{phones}{Style.RESET_ALL}")
-            print(f"{'':26}{Fore.CYAN}Emails:{Style.RESET_ALL}   {Fore.GREEN}{emails}{Style.RESET_ALL}")
-            print(f"{'':26}{Fore.CYAN}Address:{Style.RESET_ALL}  {Fore.GREEN}{address}{Style.RESET_ALL}")
-            print(f"{'':26}{Fore.CYAN}Birthday:{Style.RESET_ALL} {Fore.GREEN}{birthday}{Style.RESET_ALL}")
-            print(f"{Fore.BLUE}{'-' * 120}{Style.RESET_ALL}")
+    @staticmethod
+    def print_contacts_table(contacts, total=None):
+        """Print contacts in a formatted table with colors
+
+        contacts may be any iterable (rows are printed as they arrive) when
+        total gives their number.
+        """
+        if total is None:
+            total = len(contacts)
+        if not total:
+            print(Presenter.info("No contacts stored."))
+            return
 
-        print(f"{Fore.CYAN}Total contacts: {len(contacts)}{Style.RESET_ALL}\n")
+        # Every page is rendered from the row template and written at once
+        palette = Presenter._palette
+        row = palette.contact_row
+        write = sys.stdout.write
+        chunks = [palette.contacts_header]
+        shown = 0
+        for page in Presenter.pages(contacts):
+            for contact in page:
+                shown += 1
+                phones = contact.phones
+                emails = contact.emails
+                address = contact.address
+                birthday = contact.birthday
+                chunks.append(row.format(
+                    shown,
+                    contact.name.value,
+                    "; ".join(p.value for p in phones) if phones else "-",
+                    "; ".join(e.value for e in emails) if emails else "-",
+                    address.value if address else "-",
+                    str(birthday) if birthday else "-",
+                ))
+            write("".join(chunks))
+            chunks = []
+
+        if shown < total:
+            write(palette.footer.format(f"Shown {shown} of {total} contacts"))
+        else:
+            write(palette.footer.format(f"Total contacts: {total}"))
 
     @staticmethod
     def print_prompt():
@@ -163,46 +266,54 @@ class Presenter:
             print(Presenter.warning(f"No contacts have birthdays in the next {days} days."))
             return
 
-        # Header
-        print(f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Birthday Information':<90}{Style.RESET_ALL}")
-        print(f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
-
-        # Print each birthday
-        for idx, result in enumerate(results, 1):
-            # Prepare data
-            jubilee = (
-                " (BIG JUBILEE)"
-                if result["jubilee_type"] == "большой юбилей"
-                else " (Jubilee)"
-                if result["is_jubilee"]
-                else ""
-            )
-            age_display = f"{result['age']} years{jubilee}"
-            phone = result["phone"] if result["phone"] else "-"
-            email = result["email"] if result["email"] else "-"
-            birthday_display = (
-                f"{result['actual_birthday_weekday']} {result['actual_birthday_date']}"
-                if result["is_shifted"]
-                else f"{result['weekday']} {result['date']}"
-            )
-
-            # Print birthday info
-            print(f"{Fore.YELLOW}{idx:<4}{Style.RESET_ALL} {Fore.MAGENTA}{result['name']:<20}{Style.RESET_ALL}")
-            print(f"{'':26}{Fore.CYAN}Age:{Style.RESET_ALL}        {Fore.GREEN}{age_display}{Style.RESET_ALL}")
-            print(f"{'':26}{Fore.CYAN}Birthday:{Style.RESET_ALL}   {Fore.GREEN}{birthday_display}{Style.RESET_ALL}")
-            if result["is_shifted"]:
-                print(
-                    f"{'':26}{Fore.CYAN}Congratulate:{Style.RESET_ALL} {Fore.GREEN}{result['weekday']} {result['date']} (shifted from {result['shift_reason']}){Style.RESET_ALL}"
+        palette = Presenter._palette
+        row = palette.birthday_row
+        shifted_row = palette.shifted_birthday_row
+        write = sys.stdout.write
+        chunks = [palette.birthdays_header]
+
+        # Rows compute their values on lookup, so read each one once
+        jubilees = big_jubilees = shifted = 0
+        idx = 0
+        for page in Presenter.pages(results):
+            for result in page:
+                idx += 1
+                jubilee_type = result["jubilee_type"]
+                is_jubilee = result["is_jubilee"]
+                is_shifted = result["is_shifted"]
+                big_jubilee = jubilee_type == "большой юбилей"
+                jubilees += is_jubilee
+                big_jubilees += big_jubilee
+                shifted += is_shifted
+
+                jubilee = (
+                    " (BIG JUBILEE)"
+                    if big_jubilee
+                    else " (Jubilee)"
+                    if is_jubilee
+                    else ""
                 )
-            print(f"{'':26}{Fore.CYAN}Phone:{Style.RESET_ALL}      {Fore.GREEN}{phone}{Style.RESET_ALL}")
-            print(f"{'':26}{Fore.CYAN}Email:{Style.RESET_ALL}      {Fore.GREEN}{email}{Style.RESET_ALL}")
-            print(f"{Fore.BLUE}{'-' * 120}{Style.RESET_ALL}")
-
-        # Statistics
-        jubilees = sum(1 for r in results if r["is_jubilee"])
-        big_jubilees = sum(1 for r in results if r["jubilee_type"] == "большой юбилей")
-        shifted = sum(1 for r in results if r["is_shifted"])
+                age_display = f"{result['age']} years{jubilee}"
+                phone = result["phone"] or "-"
+                email = result["email"] or "-"
+                date_display = f"{result['weekday']} {result['date']}"
+                if is_shifted:
+                    birthday_display = f"{result['actual_birthday_weekday']} {result['actual_birthday_date']}"
+                    chunks.append(shifted_row.format(
+                        idx, result["name"], age_display, birthday_display,
+                        date_display, result["shift_reason"], phone, email,
+                    ))
+                else:
+                    chunks.append(row.format(idx, result["name"], age_display, date_display, phone, email))
+            write("".join(chunks))
+            chunks = []
+
+        # Statistics also cover the rows left unshown if the listing was stopped
+        for result in results[idx:]:
+            is_jubilee = result["is_jubilee"]
+            jubilees += is_jubilee
+            big_jubilees += is_jubilee and result["jubilee_type"] == "большой юбилей"
+            shifted += result["is_shifted"]
 
         stats = f"Total: {len(results)} birthdays"
         if jubilees:
@@ -210,7 +321,7 @@ class Presenter:
         if shifted:
             stats += f" | Weekend shifts: {shifted}"
 
-        print(f"{Fore.CYAN}{stats}{Style.RESET_ALL}\n")
+        write(palette.footer.format(stats))
 
     @staticmethod
     def print_help_table():
@@ -256,9 +367,9 @@ class Presenter:
 
         commands_notes = [
             ("note-add [text] [tag1,tag2,...] or na", "Add a note"),
-            ("note-del [filter] or nd", "Delete a note"),
-            ("note-list [filter] or nl", "Show list of notes (with filtering)"),
-            ("note-edit [filter] or ne", "Edit a note"),
+            ("note-del [filter|#ID] or nd", "Delete a note by its ID"),
+            ("note-list [filter] or nl", "Show notes matching words (prefixes, OR for alternatives), best first"),
+            ("note-edit [filter|#ID] or ne", "Edit a note by its ID"),
             ("tag", "Show notes sorted by tags"),
         ]
 
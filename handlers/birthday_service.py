@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from collections.abc import Mapping
 from datetime import date, datetime, timedelta
 from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any
 
 from models.contact import Record
+from repositories.birthday_index import DAY_KEYS, MAX_OFFSET, MONTH_STRIDE, window_offsets
+
+try:
+    import numpy as np
+except ImportError:  # optional: a plain loop over the packed arrays does the same
+    np = None
 
 DATE_OUTPUT_FORMAT = "%d.%m.%Y"
 WEEKDAY_OUTPUT_FORMAT = "%A"
 WEEKEND_SHIFTS = {5: 2, 6: 1}  # Saturday: +2 days, Sunday: +1 day
 WEEKEND_NAMES = {5: "Saturday", 6: "Sunday"}
+# Offset table value of month/day pairs outside the window
+_NOT_IN_WINDOW = 0xFFFF
 
 
 class JubileeType(Enum):
@@ -22,50 +33,160 @@ class JubileeType(Enum):
     BIG = "big jubilee"
 
 
-@dataclass
 class BirthdayRecord:
-    """Birthday record with useful methods."""
-    actual_birthday: date
-    contact: Record
-    original_birth_date: date
-    
-    @property
-    def congratulation_date(self) -> date:
-        """Get congratulation date (shifted to Monday if weekend)."""
-        shift_days = WEEKEND_SHIFTS.get(self.actual_birthday.weekday(), 0)
-        return self.actual_birthday + timedelta(days=shift_days)
-    
+    """Birthday record; everything derived from the dates is computed once, up front."""
+
+    __slots__ = (
+        "actual_birthday", "contact", "original_birth_date", "shift_days",
+        "congratulation_date", "age", "jubilee_type", "sort_key",
+    )
+
+    def __init__(
+        self,
+        actual_birthday: date,
+        contact: Record,
+        original_birth_date: date,
+        shift_days: int | None = None,
+        age: int | None = None,
+    ) -> None:
+        """Shift and age may be handed in when next_birthdays already computed them."""
+        self.actual_birthday = actual_birthday
+        self.contact = contact
+        self.original_birth_date = original_birth_date
+        if shift_days is None:
+            shift_days = WEEKEND_SHIFTS.get(actual_birthday.weekday(), 0)
+        if age is None:
+            age = actual_birthday.year - original_birth_date.year
+        self.shift_days = shift_days
+        # Shifted to Monday if the birthday falls on a weekend
+        self.congratulation_date = actual_birthday + timedelta(days=shift_days) if shift_days else actual_birthday
+        self.age = age
+        self.jubilee_type = self._jubilee(age)
+        self.sort_key = (self.congratulation_date, contact.name.value.lower())
+
     @property
     def is_shifted(self) -> bool:
         """Check if date was shifted to Monday."""
-        return self.congratulation_date != self.actual_birthday
-    
+        return self.shift_days != 0
+
     @property
     def shift_reason(self) -> str:
         """Get weekend day name if shifted."""
-        return WEEKEND_NAMES.get(self.actual_birthday.weekday(), "") if self.is_shifted else ""
-    
-    @property
-    def age(self) -> int:
-        """Calculate age in years."""
-        return self.actual_birthday.year - self.original_birth_date.year
-    
-    @property
-    def jubilee_type(self) -> str:
-        """Get jubilee type."""
-        if self.age <= 0:
+        return WEEKEND_NAMES.get(self.actual_birthday.weekday(), "") if self.shift_days else ""
+
+    @staticmethod
+    def _jubilee(age: int) -> str:
+        if age <= 0:
             return JubileeType.NONE.value
-        if self.age % 10 == 0:
+        if age % 10 == 0:
             return JubileeType.BIG.value
-        if self.age % 5 == 0:
+        if age % 5 == 0:
             return JubileeType.REGULAR.value
         return JubileeType.NONE.value
-    
+
     def __lt__(self, other: BirthdayRecord) -> bool:
         """Compare records by congratulation date and name."""
-        if self.congratulation_date != other.congratulation_date:
-            return self.congratulation_date < other.congratulation_date
-        return self.contact.name.value.lower() < other.contact.name.value.lower()
+        return self.sort_key < other.sort_key
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(actual_birthday={self.actual_birthday!r}, "
+            f"contact={self.contact.name.value!r}, original_birth_date={self.original_birth_date!r})"
+        )
+
+
+@lru_cache(maxsize=1024)
+def _date_strings(day: date) -> tuple[str, str]:
+    """(date, weekday) output strings of a day; reports keep hitting the same few hundred days."""
+    return day.strftime(DATE_OUTPUT_FORMAT), day.strftime(WEEKDAY_OUTPUT_FORMAT)
+
+
+def _first_value(fields) -> str:
+    return fields[0].value if fields else ""
+
+
+class BirthdayRow(Mapping):
+    """Output row of one BirthdayRecord.
+
+    Reads like the dict _format_record used to build, but each value is
+    produced when it is looked up, so passes that only count shifts or
+    jubilees never format dates or copy phone lists.
+    """
+
+    __slots__ = ("_record",)
+
+    _FIELDS = {
+        "date": lambda record: _date_strings(record.congratulation_date)[0],
+        "weekday": lambda record: _date_strings(record.congratulation_date)[1],
+        "actual_birthday_date": lambda record: _date_strings(record.actual_birthday)[0],
+        "actual_birthday_weekday": lambda record: _date_strings(record.actual_birthday)[1],
+        "is_shifted": lambda record: record.is_shifted,
+        "shift_reason": lambda record: record.shift_reason,
+        "name": lambda record: record.contact.name.value,
+        "age": lambda record: record.age,
+        "is_jubilee": lambda record: bool(record.jubilee_type),
+        "jubilee_type": lambda record: record.jubilee_type,
+        "phone": lambda record: _first_value(record.contact.phones),
+        "email": lambda record: _first_value(record.contact.emails),
+        "phones": lambda record: [phone.value for phone in record.contact.phones],
+        "emails": lambda record: [email.value for email in record.contact.emails],
+    }
+
+    def __init__(self, record: BirthdayRecord) -> None:
+        self._record = record
+
+    def __getitem__(self, key: str) -> Any:
+        return self._FIELDS[key](self._record)
+
+    def __iter__(self):
+        return iter(self._FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._FIELDS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def next_birthdays(months, days, years, start: date, window: int) -> tuple[list, list, list, list]:
+    """Rows of packed birth dates whose next birthday falls within window days after start.
+
+    months, days and years are row aligned arrays (0 for rows without a
+    birthday). Returns the hit rows with, per row, the offset of the next
+    birthday from start, its weekend shift and the age reached. Every
+    month/day pair is resolved once into an offset table, so the per-row
+    work is a lookup: vectorised with NumPy when it is installed.
+    """
+    offset_of = array("H", [_NOT_IN_WINDOW]) * DAY_KEYS
+    for offset, month, day in window_offsets(start, window):
+        offset_of[month * MONTH_STRIDE + day] = offset
+
+    span = min(window, MAX_OFFSET) + 1
+    weekday = start.weekday()
+    shift_of = bytes(WEEKEND_SHIFTS.get((weekday + offset) % 7, 0) for offset in range(span))
+    # Offsets from here on land in the next year
+    new_year = (date(start.year + 1, 1, 1) - start).days
+
+    if np is not None and len(months):
+        keys = np.frombuffer(months, dtype=np.uint8).astype(np.intp) * MONTH_STRIDE
+        keys += np.frombuffer(days, dtype=np.uint8)
+        offsets = np.frombuffer(offset_of, dtype=np.uint16)[keys]
+        rows = np.flatnonzero(offsets != _NOT_IN_WINDOW)
+        offsets = offsets[rows].astype(np.intp)
+        shifts = np.frombuffer(shift_of, dtype=np.uint8)[offsets]
+        ages = start.year + (offsets >= new_year) - np.frombuffer(years, dtype=np.uint16)[rows].astype(np.intp)
+        return rows.tolist(), offsets.tolist(), shifts.tolist(), ages.tolist()
+
+    rows, offsets, shifts, ages = [], [], [], []
+    for row in range(len(months)):
+        offset = offset_of[months[row] * MONTH_STRIDE + days[row]]
+        if offset == _NOT_IN_WINDOW:
+            continue
+        rows.append(row)
+        offsets.append(offset)
+        shifts.append(shift_of[offset])
+        ages.append(start.year + (offset >= new_year) - years[row])
+    return rows, offsets, shifts, ages
 
 
 class BirthdayService:
@@ -75,15 +196,16 @@ class BirthdayService:
         """Initialize with a contact repository."""
         self._repository = repository
 
-    def find_near(self, days: int) -> list[dict[str, Any]]:
+    def find_near(self, days: int) -> list[BirthdayRow]:
         """Find contacts with birthdays within the specified number of days."""
         if days < 0:
             raise ValueError("Parameter 'days' must be non-negative.")
         
         records = self._collect_records(days)
-        return [self._format_record(record) for record in sorted(records)]
+        records.sort(key=attrgetter("sort_key"))
+        return [self._format_record(record) for record in records]
 
-    def find_on_date(self, target_date: str | date) -> list[dict[str, Any]]:
+    def find_on_date(self, target_date: str | date) -> list[BirthdayRow]:
         """Find contacts with birthdays on a specific date (ignoring year)."""
         # Parse target date if it's a string
         if isinstance(target_date, str):
@@ -97,7 +219,7 @@ class BirthdayService:
         records = []
         today = date.today()
         
-        for contact in self._repository.get_all_contacts():
+        for contact in self._repository.contacts_born_on(target_date.month, target_date.day):
             if not contact.birthday:
                 continue
             
@@ -118,36 +240,32 @@ class BirthdayService:
                 continue
         
         # Sort by name
-        records.sort(key=lambda r: r.contact.name.value.lower())
+        records.sort(key=lambda r: r.sort_key[1])
         return [self._format_record(record) for record in records]
 
-    def find_today(self) -> list[dict[str, Any]]:
+    def find_today(self) -> list[BirthdayRow]:
         """Find contacts with birthdays today."""
         return self.find_on_date(date.today())
 
     def _collect_records(self, days: int) -> list[BirthdayRecord]:
         """Collect contacts whose birthdays fall within the specified days."""
-        records = []
         today = date.today()
-        
-        for contact in self._repository.get_all_contacts():
-            if not contact.birthday:
-                continue
-            
-            try:
-                birth_date = self._extract_date(contact.birthday)
-                birthday_this_year = self._get_next_birthday(birth_date, today)
-                
-                if 0 <= (birthday_this_year - today).days <= days:
-                    records.append(BirthdayRecord(
-                        actual_birthday=birthday_this_year,
-                        contact=contact,
-                        original_birth_date=birth_date
-                    ))
-            except (TypeError, ValueError):
-                continue
-        
-        return records
+        names, months, birth_days, years = self._repository.birthday_columns(today, days)
+        hits = next_birthdays(months, birth_days, years, today, days)
+
+        # Records are only built for the contacts that made it into the window
+        next_dates = [today + timedelta(days=offset) for offset in range(min(days, MAX_OFFSET) + 1)]
+        find_contact = self._repository.find_contact
+        return [
+            BirthdayRecord(
+                next_dates[offset],
+                find_contact(names[row]),
+                date(years[row], months[row], birth_days[row]),
+                shift,
+                age,
+            )
+            for row, offset, shift, age in zip(*hits)
+        ]
 
     def _get_next_birthday(self, birth_date: date, today: date) -> date:
         """Get next birthday date (this year or next year)."""
@@ -177,25 +295,6 @@ class BirthdayService:
         raise TypeError(f"Invalid birthday type: {type(birthday_obj)!r}")
     
     @staticmethod
-    def _format_record(record: BirthdayRecord) -> dict[str, Any]:
-        """Format a single birthday record into a dictionary."""
-        phones = [p.value for p in record.contact.phones]
-        emails = [e.value for e in record.contact.emails]
-        
-        return {
-            "date": record.congratulation_date.strftime(DATE_OUTPUT_FORMAT),
-            "weekday": record.congratulation_date.strftime(WEEKDAY_OUTPUT_FORMAT),
-            "actual_birthday_date": record.actual_birthday.strftime(DATE_OUTPUT_FORMAT),
-            "actual_birthday_weekday": record.actual_birthday.strftime(WEEKDAY_OUTPUT_FORMAT),
-            "is_shifted": record.is_shifted,
-            "shift_reason": record.shift_reason,
-            "name": record.contact.name.value,
-            "age": record.age,
-            "is_jubilee": bool(record.jubilee_type),
-            "jubilee_type": record.jubilee_type,
-            "phone": next(iter(phones), ""),
-            "email": next(iter(emails), ""),
-            "phones": phones,
-            "emails": emails,
-        }
-
+    def _format_record(record: BirthdayRecord) -> BirthdayRow:
+        """Format a single birthday record into a (lazily computed) dict-like row."""
+        return BirthdayRow(record)
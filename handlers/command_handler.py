@@ -1,3 +1,5 @@
+from itertools import chain
+
 from cli.presenter import Presenter
 from models.contact import Record
 from models.note import Note
@@ -96,6 +98,7 @@ class CommandHandler:
                 print(Presenter.error(f"Error: {e}. Please try again or press Enter to skip."))
                 continue
 
+        self.repository.update_contact(contact)
         return Presenter.success("Contact added.")
 
     @input_error
@@ -117,10 +120,11 @@ class CommandHandler:
     @input_error
     def show_all_contacts(self):
         """Show all contacts"""
-        contacts = self.repository.get_all_contacts()
-        if not contacts:
+        total = self.repository.contact_count()
+        if not total:
             return Presenter.warning("No contacts stored.")
-        Presenter.print_contacts_table(contacts)
+        # Streamed from the repository, so printing starts before the whole book is read
+        Presenter.print_contacts_table(self.repository.iter_contacts(), total)
         return ""
 
     @input_error
@@ -196,7 +200,7 @@ class CommandHandler:
             raise ValueError(f"Contact {new_name} already exists.")
 
         self.repository.delete_contact(current_name)
-        contact.name.value = new_name
+        contact.rename(new_name)
         self.repository.add_contact(contact)
 
         return Presenter.success(f"Contact name changed from {current_name} to {new_name}.")
@@ -218,6 +222,7 @@ class CommandHandler:
                         return None
                     try:
                         contact.add_phone(new_phone)
+                        self.repository.update_contact(contact)
                         return Presenter.success(f"Phone {new_phone} added to contact {name}.")
                     except Exception as e:
                         print(Presenter.error(f"Error: {e}. Please try again."))
@@ -272,6 +277,7 @@ class CommandHandler:
                 return None
             try:
                 contact.edit_phone(old_phone, new_phone)
+                self.repository.update_contact(contact)
                 return Presenter.success(f"Phone number for {name} changed from {old_phone} to {new_phone}.")
             except Exception as e:
                 print(Presenter.error(f"Error: {e}. Please try again."))
@@ -294,6 +300,7 @@ class CommandHandler:
                         return None
                     try:
                         contact.add_email(new_email)
+                        self.repository.update_contact(contact)
                         return Presenter.success(f"Email {new_email} added to contact {name}.")
                     except Exception as e:
                         print(Presenter.error(f"Error: {e}. Please try again."))
@@ -348,6 +355,7 @@ class CommandHandler:
                 return None
             try:
                 contact.edit_email(old_email, new_email)
+                self.repository.update_contact(contact)
                 return Presenter.success(f"Email for {name} changed from {old_email} to {new_email}.")
             except Exception as e:
                 print(Presenter.error(f"Error: {e}. Please try again."))
@@ -364,6 +372,7 @@ class CommandHandler:
         if not new_address:
             return None
         contact.set_address(new_address)
+        self.repository.update_contact(contact)
         return Presenter.success(f"Address for {name} updated to: {new_address}.")
 
     @input_error
@@ -380,6 +389,7 @@ class CommandHandler:
 
             try:
                 contact.set_birthday(birthday)
+                self.repository.update_contact(contact)
                 return Presenter.success(f"Birthday for {name} updated to: {birthday}.")
             except Exception as e:
                 print(Presenter.error(f"Error: {e}. Please try again."))
@@ -412,7 +422,7 @@ class CommandHandler:
             raise ValueError(f"Contact {new_name} already exists.")
 
         self.repository.delete_contact(name)
-        contact.name.value = new_name
+        contact.rename(new_name)
         self.repository.add_contact(contact)
 
         return Presenter.success(f"Contact name changed from {name} to {new_name}.")
@@ -478,6 +488,7 @@ class CommandHandler:
                 )
 
         record.remove_phone(phone)
+        self.repository.update_contact(record)
         return Presenter.success(f"Phone {phone} removed from contact {name}.")
 
     @input_error
@@ -537,43 +548,29 @@ class CommandHandler:
 
     @input_error
     def note_del(self, query=None):
-        while True:
-            notes, msg = self.repository.search_notes(query)
-            print(msg)
-
-            query = input(Presenter.info("Enter a search string (or press Enter to continue): ")).strip()
-            if not query:
-                break
-
-        if not notes:
-            return "No notes to delete. Deletion cancelled."
-
-        while True:
-            user_input = input(Presenter.info(f"Enter the number of the note to delete 1-{len(notes)} (or press Enter to exit): ")).strip()
+        note_to_delete = self._note_from_reference(query)
+        if note_to_delete is None:
+            while True:
+                found = self._show_notes(query)
 
-            if not user_input:
-                break
+                query = input(Presenter.info("Enter a search string (or press Enter to continue): ")).strip()
+                if not query:
+                    break
 
-            try:
-                index = int(user_input)
-                if not 1 <= index <= len(notes):
-                    print(Presenter.warning("Invalid number. Try again."))
-                    continue
-            except ValueError:
-                print(Presenter.warning("Please enter a valid number."))
-                continue
+            if not found:
+                return "No notes to delete. Deletion cancelled."
 
-            note_to_delete = notes[index - 1]
-            print(self.repository.del_note(note_to_delete))
-            break
+            note_to_delete = self._choose_note("delete")
+            if note_to_delete is None:
+                return ""
 
+        print(self.repository.del_note(note_to_delete))
         return ""
 
     @input_error
     def note_list(self, query=None):
         while True:
-            notes, msg = self.repository.search_notes(query)
-            print(msg)
+            self._show_notes(query)
 
             query = input(Presenter.info("Enter a search string (or press Enter to exit): ")).strip()
             if not query:
@@ -583,35 +580,22 @@ class CommandHandler:
 
     @input_error
     def note_edit(self, query=None):
-        while True:
-            notes, msg = self.repository.search_notes(query)
-            print(msg)
+        note_to_edit = self._note_from_reference(query)
+        if note_to_edit is None:
+            while True:
+                found = self._show_notes(query)
 
-            query = input(Presenter.info("Enter a search string (or press Enter to continue): ")).strip()
-            if not query:
-                break
+                query = input(Presenter.info("Enter a search string (or press Enter to continue): ")).strip()
+                if not query:
+                    break
 
-        if not notes:
-            return "No notes to edit. Edit cancelled."
+            if not found:
+                return "No notes to edit. Edit cancelled."
 
-        while True:
-            user_input = input(Presenter.info(f"Enter the number of the note to edit 1-{len(notes)} (or press Enter to exit): ")).strip()
-
-            if not user_input:
+            note_to_edit = self._choose_note("edit")
+            if note_to_edit is None:
                 return "Edit cancelled."
 
-            try:
-                index = int(user_input)
-                if not 1 <= index <= len(notes):
-                    print(Presenter.warning("Invalid number. Try again."))
-                    continue
-            except ValueError:
-                print(Presenter.warning("Please enter a valid number."))
-                continue
-
-            note_to_edit = notes[index - 1]
-            break
-
         print(self.repository.format_notes(note_to_edit, " Editing..."))
         new_text = input(Presenter.info("Enter a new note text (or press Enter to continue): ")).strip()
 
@@ -621,6 +605,45 @@ class CommandHandler:
 
         return self.repository.edit_note(note_to_edit, new_text, tags)
 
+    def _show_notes(self, query):
+        """Print the notes matching query page by page; False if none matched"""
+        header = f"Notes matching filter: {query}" if query else " All notes"
+        notes = iter(self.repository.note_matches(query))
+        first = next(notes, None)
+        for line in Presenter.paginate(self.repository.note_lines(chain([first] if first else [], notes), header)):
+            print(line)
+        return first is not None
+
+    def _note_from_reference(self, query):
+        """The note a "#ID" argument points at; None for any other argument"""
+        if query and query.startswith("#") and query[1:].isdigit():
+            note_id = int(query[1:])
+            note = self.repository.get_note(note_id)
+            if note is None:
+                # Searching for the digits instead would offer unrelated notes
+                raise KeyError(f"Note #{note_id} not found.")
+            return note
+        return None
+
+    def _choose_note(self, action):
+        """Ask for the ID of a listed note until a valid one is given; None if skipped"""
+        while True:
+            user_input = input(Presenter.info(f"Enter the ID of the note to {action} (or press Enter to exit): ")).strip()
+
+            if not user_input:
+                return None
+
+            try:
+                note = self.repository.get_note(int(user_input.lstrip("#")))
+            except ValueError:
+                print(Presenter.warning("Please enter a valid ID."))
+                continue
+
+            if note is None:
+                print(Presenter.warning("No note with this ID. Try again."))
+                continue
+            return note
+
     @input_error
     def tag(self):
         return self.repository.notes_by_tags()
@@ -1,3 +1,4 @@
+import argparse
 import sys
 
 from cli.command_suggester import CommandSuggester
@@ -5,16 +6,74 @@ from cli.presenter import Presenter
 from cli.prompt_manager import PromptManager
 from handlers.command_handler import CommandHandler
 from repositories.contact_repository import ContactRepository
+from storage.autosave import AUTOSAVE_DELAY, AutoSaver
 from storage.factory import StorageFactory
 from utils.utils import parse_user_input_data
 
+DEFAULT_PAGE_SIZE = 20
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="assistant-bot-G30")
+    parser.add_argument(
+        "storage_type", nargs="?", default="pkl",
+        help=(
+            f"storage format: {', '.join(StorageFactory.get_supported_types())}; "
+            f"append .{'/.'.join(StorageFactory.get_compression_codecs())} to compress (e.g. json.gz)"
+        ),
+    )
+    parser.add_argument(
+        "--lazy", action="store_true",
+        help="load contact names only and read records when they are needed",
+    )
+    parser.add_argument(
+        "--no-indent", action="store_true",
+        help="write json without indentation (smaller files, faster saves)",
+    )
+    parser.add_argument(
+        "--backups", type=int, metavar="N",
+        help="number of previous saves to keep as file.bak1..N (default 1, 0 disables)",
+    )
+    parser.add_argument(
+        "--shards", type=int, metavar="N",
+        help="number of contact shard files for the shards storage (default 16)",
+    )
+    parser.add_argument(
+        "--processes", type=int, metavar="N",
+        help="decode and encode shards in N worker processes (shards storage)",
+    )
+    parser.add_argument(
+        "--columnar", action="store_true",
+        help="answer search and birthday queries by scanning columns instead of keeping indexes",
+    )
+    parser.add_argument(
+        "--autosave", type=float, default=AUTOSAVE_DELAY, metavar="SECONDS",
+        help=f"save this long after the last change (default {AUTOSAVE_DELAY:g}, 0 saves on exit only)",
+    )
+    parser.add_argument(
+        "--page-size", type=int, metavar="N",
+        help="rows per page of long listings (default 20 in a terminal, 0 prints everything at once)",
+    )
+    parser.add_argument(
+        "--no-color", action="store_true",
+        help="print without colours (the default when output is not a terminal)",
+    )
+    return parser.parse_args(argv)
+
 
 def main():
     # Initialize repositories and handlers
-    storage_type = sys.argv[1] if len(sys.argv) > 1 else "pkl"
+    args = parse_args(sys.argv[1:])
 
     try:
-        storage = StorageFactory.create_storage(storage_type)
+        options = {"indent": None} if args.no_indent else {}
+        if args.backups is not None:
+            options["backups"] = args.backups
+        if args.shards is not None:
+            options["shards"] = args.shards
+        if args.processes is not None:
+            options["processes"] = args.processes
+        storage = StorageFactory.create_storage(args.storage_type, lazy=args.lazy, **options)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -22,6 +81,15 @@ def main():
     repository = storage.load()
     if not isinstance(repository, ContactRepository):
         repository = ContactRepository()
+    if args.columnar:
+        repository.use_columnar()
+        if not repository.columnar:
+            print(Presenter.warning(f"--columnar has no effect with {args.storage_type} storage."))
+    storage.attach(repository)
+
+    autosaver = AutoSaver(storage, repository, delay=args.autosave)
+    if args.autosave > 0:
+        autosaver.start()
 
     command_handler = CommandHandler(repository)
     command_suggester = CommandSuggester()
@@ -29,6 +97,12 @@ def main():
         commands=CommandSuggester.AVAILABLE_COMMANDS
         )
 
+    if args.page_size is None:
+        args.page_size = DEFAULT_PAGE_SIZE if sys.stdin.isatty() and sys.stdout.isatty() else 0
+    Presenter.page_size = max(args.page_size, 0)
+    if args.no_color or not sys.stdout.isatty():
+        Presenter.set_color(False)
+
     # Display welcome message
     Presenter.print_welcome()
 
@@ -44,7 +118,10 @@ def main():
                         print("Good bye User!")
                         break
                     if command_handler[command]:
-                        print(command_handler[command](*args))
+                        # Commands may ask follow-up questions; the autosaver waits for them
+                        with autosaver.lock:
+                            result = command_handler[command](*args)
+                        print(result)
                     else:
                         print(
                             command_suggester.get_suggestion_message(command)
@@ -64,7 +141,7 @@ def main():
                 # Handle unexpected errors
                 print(Presenter.error(f"Unexpected error: {str(e)}"))
     finally:
-        storage.save(repository)
+        autosaver.stop()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ from datetime import datetime
 
 
 class Birthday(Field):
+    __slots__ = ()
+
     # DD.MM.YYYY format
     def __init__(self, value):
         try:
@@ -6,24 +6,68 @@ from models.address import Address
 
 
 class Record:
+    __slots__ = ("name", "phones", "emails", "address", "birthday", "_search_keys")
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones = []
         self.emails = []
         self.address = None
         self.birthday = None
+        self._search_keys = None
+
+    def __getstate__(self):
+        return {
+            "name": self.name,
+            "phones": self.phones,
+            "emails": self.emails,
+            "address": self.address,
+            "birthday": self.birthday,
+        }
+
+    def __setstate__(self, state):
+        # Also reads records pickled while they still had a __dict__
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        self._search_keys = None
+
+    @property
+    def search_keys(self) -> tuple:
+        """Lowercased searchable fields, rebuilt only after the record changes"""
+        if self._search_keys is None:
+            keys = [self.name.value.lower()]
+            keys.extend(p.value.lower() for p in self.phones)
+            keys.extend(e.value.lower() for e in self.emails)
+            if self.address:
+                keys.append(self.address.value.lower())
+            if self.birthday:
+                keys.append(str(self.birthday).lower())
+            self._search_keys = tuple(keys)
+        return self._search_keys
+
+    def _invalidate_search_keys(self):
+        self._search_keys = None
+
+    def rename(self, new_name: str):
+        """Change the contact name"""
+        self.name.value = new_name
+        self._invalidate_search_keys()
 
     def add_phone(self, phone):
         self.phones.append(Phone(phone))
+        self._invalidate_search_keys()
 
     def add_email(self, email):
         self.emails.append(Email(email))
+        self._invalidate_search_keys()
 
     def set_address(self, address):
         self.address = Address(address)
+        self._invalidate_search_keys()
 
     def set_birthday(self, birthday):
         self.birthday = Birthday(birthday)
+        self._invalidate_search_keys()
 
     def find_phone(self, phone: str):
         """Find a phone by value"""
@@ -37,6 +81,7 @@ class Record:
         phone_obj = self.find_phone(old_phone)
         if phone_obj:
             phone_obj.value = new_phone
+            self._invalidate_search_keys()
         else:
             raise ValueError(f"Phone {old_phone} not found.")
 
@@ -45,6 +90,7 @@ class Record:
         phone_obj = self.find_phone(phone)
         if phone_obj:
             self.phones.remove(phone_obj)
+            self._invalidate_search_keys()
         else:
             raise ValueError(f"Phone {phone} not found.")
 
@@ -60,6 +106,7 @@ class Record:
         email_obj = self.find_email(old_email)
         if email_obj:
             email_obj.value = new_email
+            self._invalidate_search_keys()
         else:
             raise ValueError(f"Email {old_email} not found.")
 
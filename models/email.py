@@ -4,6 +4,8 @@ from models.field import Field
 
 
 class Email(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__(value)
 
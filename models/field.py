@@ -1,7 +1,17 @@
 class Field:
+    # No per-instance __dict__: a book holds several fields per contact
+    __slots__ = ("_value",)
+
     def __init__(self, value):
         self.value = value
 
+    def __getstate__(self):
+        return {"_value": self._value}
+
+    def __setstate__(self, state):
+        # Also reads fields pickled while they still had a __dict__
+        self._value = state["_value"]
+
     def __str__(self):
         return str(self.value)
 
@@ -1,7 +1,11 @@
 
 class Note:
+    __slots__ = ("text", "tags", "id")
+
     def __init__(self, text, tags=None):
         self.text = text
+        # Given by the repository the note is added to
+        self.id = None
 
         if tags is None:
             self.tags = []
@@ -13,8 +17,17 @@ class Note:
         # Опціонально — привести теги до нижнього регістру
         # self.tags = [t.lower() for t in self.tags]
 
+    def __getstate__(self):
+        return {"text": self.text, "tags": self.tags, "id": self.id}
+
+    def __setstate__(self, state):
+        self.text = state["text"]
+        self.tags = state["tags"]
+        # Notes saved before they had IDs get one when they are loaded
+        self.id = state.get("id")
+
     def to_dict(self):
-        return {"text": self.text, "tags": self.tags}
+        return {"id": self.id, "text": self.text, "tags": self.tags}
 
     def __str__(self):
         if self.tags:
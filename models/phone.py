@@ -4,6 +4,8 @@ from utils.utils import normalize_phone
 
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__(value)
 
@@ -0,0 +1,88 @@
+"""Calendar index: contact names bucketed by the day of year of their birthday."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+CALENDAR_SLOTS = 366
+_LEAP_YEAR = 2000
+# A next birthday is never more than a year (plus Feb 29) away
+MAX_OFFSET = 365
+# Packed birth dates are looked up by month * MONTH_STRIDE + day
+MONTH_STRIDE = 32
+DAY_KEYS = 13 * MONTH_STRIDE
+
+
+def calendar_slot(month: int, day: int) -> int:
+    """Slot of a month/day pair in a leap-year calendar (Feb 29 gets its own slot)."""
+    return date(_LEAP_YEAR, month, day).timetuple().tm_yday - 1
+
+
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def window_offsets(start: date, days: int):
+    """(offset, month, day) of every distinct birthday falling within days after start, nearest first.
+
+    The offset is the number of days from start to that next birthday.
+    """
+    seen: set[tuple[int, int]] = set()
+
+    for offset in range(min(days, MAX_OFFSET) + 1):
+        current = start + timedelta(days=offset)
+        pairs = [(current.month, current.day)]
+        # Feb 29 birthdays are celebrated on Feb 28 in common years
+        if pairs[0] == (2, 28) and not _is_leap(current.year):
+            pairs.append((2, 29))
+
+        for pair in pairs:
+            if pair not in seen:
+                seen.add(pair)
+                yield (offset, *pair)
+
+
+def window_days(start: date, days: int):
+    """Distinct (month, day) pairs a birthday may have to fall within days after start."""
+    for _, month, day in window_offsets(start, days):
+        yield month, day
+
+
+class BirthdayIndex:
+    """Keeps one bucket of names per calendar day for window lookups."""
+
+    def __init__(self) -> None:
+        self._slots: list[dict[str, None]] = [{} for _ in range(CALENDAR_SLOTS)]
+        self._slot_of: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, key: str, birth_date) -> None:
+        """Place key in the bucket of birth_date, or drop it when there is none."""
+        slot = calendar_slot(birth_date.month, birth_date.day) if birth_date else None
+        old_slot = self._slot_of.get(key)
+        if old_slot == slot:
+            return
+        if old_slot is not None:
+            del self._slots[old_slot][key]
+            del self._slot_of[key]
+        if slot is not None:
+            self._slots[slot][key] = None
+            self._slot_of[key] = slot
+
+    def remove(self, key: str) -> None:
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def on_day(self, month: int, day: int) -> list[str]:
+        """Keys whose birthday is exactly this month and day."""
+        return list(self._slots[calendar_slot(month, day)])
+
+    def in_window(self, start: date, days: int) -> list[str]:
+        """Keys whose birthday may fall within days after start (inclusive)."""
+        keys: list[str] = []
+        for month, day in window_days(start, days):
+            keys.extend(self._slots[calendar_slot(month, day)])
+        return keys
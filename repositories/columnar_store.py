@@ -0,0 +1,146 @@
+"""Contacts held column by column, for queries that scan the whole book."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import date
+
+from repositories.birthday_index import DAY_KEYS, MONTH_STRIDE, window_days
+
+try:
+    import numpy as np
+except ImportError:  # optional: plain array loops do the same scans
+    np = None
+
+_SEPARATOR = "\x00"
+
+
+class ColumnarStore:
+    """Parallel columns with one row per contact.
+
+    Search texts are scanned as a single joined string, birth dates live in
+    month/day/year arrays that NumPy (when installed) filters as vectors.
+    Answers the same queries as NgramIndex.search and BirthdayIndex.on_day /
+    in_window, so the repository can use it in their place.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list = []          # row -> key, None once removed
+        self._rows: dict = {}          # key -> row
+        self._texts: list[str] = []
+        # 0 everywhere for contacts without a birthday
+        self._months = array("B")
+        self._days = array("B")
+        self._years = array("H")
+        # All texts joined, rebuilt on the first search after a change
+        self._blob = None
+        self._starts = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key) -> bool:
+        return key in self._rows
+
+    def add(self, key, fields, birth_date=None) -> None:
+        """Store (or update) the search fields and birth date of key."""
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            self._texts.append("")
+            self._months.append(0)
+            self._days.append(0)
+            self._years.append(0)
+
+        self._texts[row] = " ".join(fields)
+        if birth_date:
+            self._months[row] = birth_date.month
+            self._days[row] = birth_date.day
+            self._years[row] = birth_date.year
+        else:
+            self._months[row] = self._days[row] = self._years[row] = 0
+        self._blob = None
+
+    def remove(self, key) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._keys[row] = None
+        self._texts[row] = ""
+        self._months[row] = self._days[row] = self._years[row] = 0
+        self._blob = None
+        if len(self._keys) > 2 * len(self._rows) + 64:
+            self._compact()
+
+    def search(self, query: str) -> list:
+        """Keys whose search text contains query (already lowercased), in insertion order."""
+        if _SEPARATOR in query:
+            return []
+        blob, starts = self._search_blob()
+
+        keys = []
+        position = blob.find(query)
+        while position != -1:
+            row = bisect_right(starts, position) - 1
+            if self._keys[row] is not None:
+                keys.append(self._keys[row])
+            if row + 1 == len(starts):
+                break
+            # One hit per row is enough, carry on from the next one
+            position = blob.find(query, starts[row + 1])
+        return keys
+
+    def on_day(self, month: int, day: int) -> list:
+        """Keys whose birthday is exactly this month and day."""
+        return self._born_on({(month, day)})
+
+    def in_window(self, start: date, days: int) -> list:
+        """Keys whose birthday may fall within days after start (inclusive)."""
+        return self._born_on(set(window_days(start, days)))
+
+    def columns(self) -> tuple:
+        """(keys, months, days, years) columns, row aligned.
+
+        Removed rows have a None key and 0 dates. The columns are the
+        store's own, valid until its next change.
+        """
+        return self._keys, self._months, self._days, self._years
+
+    def _born_on(self, pairs) -> list:
+        wanted = bytearray(DAY_KEYS)
+        for month, day in pairs:
+            wanted[month * MONTH_STRIDE + day] = 1
+
+        if np is not None and self._keys:
+            months = np.frombuffer(self._months, dtype=np.uint8).astype(np.intp)
+            days = np.frombuffer(self._days, dtype=np.uint8)
+            hits = np.frombuffer(wanted, dtype=np.uint8)[months * MONTH_STRIDE + days]
+            rows = np.flatnonzero(hits).tolist()
+        else:
+            months, days = self._months, self._days
+            rows = [row for row in range(len(months)) if wanted[months[row] * MONTH_STRIDE + days[row]]]
+        return [self._keys[row] for row in rows]
+
+    def _search_blob(self):
+        if self._blob is None:
+            starts = array("q")
+            offset = 0
+            for text in self._texts:
+                starts.append(offset)
+                offset += len(text) + 1
+            self._blob = _SEPARATOR.join(self._texts)
+            self._starts = starts
+        return self._blob, self._starts
+
+    def _compact(self) -> None:
+        """Drop the rows of removed keys once they outnumber the live ones."""
+        live = [row for row, key in enumerate(self._keys) if key is not None]
+        self._keys = [self._keys[row] for row in live]
+        self._texts = [self._texts[row] for row in live]
+        self._months = array("B", [self._months[row] for row in live])
+        self._days = array("B", [self._days[row] for row in live])
+        self._years = array("H", [self._years[row] for row in live])
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._blob = None
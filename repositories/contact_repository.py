@@ -1,20 +1,220 @@
+from array import array
 from collections import defaultdict
 
 from models.contact import Record
 from models.note import Note
+from repositories.birthday_index import BirthdayIndex
+from repositories.columnar_store import ColumnarStore
+from repositories.tag_index import TagIndex
 
+from search.fuzzy_index import FuzzyIndex
+from search.note_index import NoteIndex
+from search.ngram_index import NgramIndex
 from search.search_service import SearchService
 from cli.presenter import Presenter
 
 class ContactRepository:
+    # Derived lookup structures and subscribers: never persisted, rebuilt on load
+    TRANSIENT_ATTRIBUTES = (
+        "ngram_index", "fuzzy_index", "birthday_index", "column_store", "columnar",
+        "tag_index", "note_index", "_built_indexes", "_listeners",
+        "_changed_names", "_deleted_names", "_changed_note_ids", "_deleted_note_ids",
+    )
+
     def __init__(self):
         self.contacts = {}
         self.search_service = SearchService()
         self.notes = []
+        self.columnar = False
+        self._reset_indexes(ready=True)
+        self._listeners = []
+        self.mark_clean()
+
+    @classmethod
+    def from_storage(cls, contacts, notes):
+        """Wrap contacts and notes read by a storage backend; indexes are built on first use"""
+        repository = cls()
+        repository.contacts = contacts
+        repository.notes = notes
+        repository._built_indexes = set()
+        return repository
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attr in self.TRANSIENT_ATTRIBUTES:
+            state.pop(attr, None)
+        # Persisted as the plain note list, as before notes had IDs
+        del state["_notes"], state["_next_note_id"]
+        state["notes"] = self.notes
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        notes = state.pop("notes", [])
+        self.__dict__.update(state)
+        self.notes = notes
+        self._listeners = []
+        self.mark_clean()
+        self.columnar = False
+        # Building indexes is deferred to the first query so startup stays cheap
+        self._reset_indexes(ready=False)
+
+    def subscribe(self, listener):
+        """Call listener(event, payload) after every change to contacts or notes.
+
+        Events: contact_saved (Record), contact_deleted (name),
+        note_added (Note), note_edited and note_deleted ((note ID, Note)).
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @property
+    def dirty(self) -> bool:
+        """True if contacts or notes changed since the last mark_clean()"""
+        return bool(
+            self._changed_names or self._deleted_names or self._changed_note_ids or self._deleted_note_ids
+        )
+
+    def pending_changes(self):
+        """What changed since the last mark_clean().
+
+        Returns (changed, deleted, notes_changed): changed maps names to
+        their current records, deleted is a set of names. Which notes
+        changed is told by pending_note_changes().
+        """
+        changed = {name: self.contacts[name] for name in self._changed_names}
+        notes_changed = bool(self._changed_note_ids or self._deleted_note_ids)
+        return changed, set(self._deleted_names), notes_changed
+
+    def pending_note_changes(self):
+        """(changed, deleted) notes since the last mark_clean(): changed maps note IDs to notes"""
+        changed = {note_id: self.get_note(note_id) for note_id in self._changed_note_ids}
+        return changed, set(self._deleted_note_ids)
+
+    def mark_clean(self):
+        self._changed_names = set()
+        self._deleted_names = set()
+        self._changed_note_ids = set()
+        self._deleted_note_ids = set()
+
+    def _notify(self, event: str, payload):
+        # Every mutation reports itself here, so this is also the change set
+        self._track_change(event, payload)
+        for listener in self._listeners:
+            listener(event, payload)
+
+    def _track_change(self, event: str, payload):
+        if event == "contact_saved":
+            name = payload.name.value
+            self._deleted_names.discard(name)
+            self._changed_names.add(name)
+        elif event == "contact_deleted":
+            self._changed_names.discard(payload)
+            self._deleted_names.add(payload)
+        elif event == "note_added":
+            self._deleted_note_ids.discard(payload.id)
+            self._changed_note_ids.add(payload.id)
+        elif event == "note_edited":
+            self._changed_note_ids.add(payload[0])
+        elif event == "note_deleted":
+            self._changed_note_ids.discard(payload[0])
+            self._deleted_note_ids.add(payload[0])
+
+    def use_columnar(self, enabled: bool = True):
+        """Answer substring and birthday queries by scanning a ColumnarStore instead of indexes"""
+        self.columnar = enabled
+        self._reset_indexes(ready=False)
+
+    def _reset_indexes(self, ready: bool):
+        self.fuzzy_index = FuzzyIndex()
+        if self.columnar:
+            # One store serves both kinds of lookups
+            self.column_store = ColumnarStore()
+            self.ngram_index = self.birthday_index = self.column_store
+        else:
+            self.column_store = None
+            self.ngram_index = NgramIndex()
+            self.birthday_index = BirthdayIndex()
+        # Kinds of contact index built so far; each is built by the first
+        # query that needs it, so a birthday list never builds search indexes
+        self._built_indexes = set(self._index_kinds()) if ready else set()
+        # Built from the note list on first use
+        self.tag_index = self.note_index = None
+
+    def _index_kinds(self):
+        if self.column_store is not None:
+            return ("columns", "fuzzy")
+        return ("ngram", "birthday", "fuzzy")
+
+    def rebuild_indexes(self):
+        """Rebuild every lookup index from the stored contacts"""
+        self._reset_indexes(ready=False)
+        for kind in self._index_kinds():
+            self._ensure_index(kind)
+
+    def _ensure_index(self, kind: str):
+        """Build the contact index of this kind ("ngram", "birthday" or "fuzzy") if it isn't yet"""
+        if kind != "fuzzy" and self.column_store is not None:
+            kind = "columns"
+        if kind in self._built_indexes:
+            return
+        for name, fields, birth_date in self._index_entries(with_fields=kind != "birthday"):
+            self._add_to_index(kind, name, fields, birth_date)
+        self._built_indexes.add(kind)
+
+    def _index_entries(self, with_fields: bool = True):
+        # Lazily loaded contacts can describe themselves without loading records
+        summaries = getattr(self.contacts, "summaries", None)
+        if summaries is not None:
+            return summaries()
+        collect_fields = self.search_service.collect_fields if with_fields else lambda record: None
+        return (
+            (record.name.value, collect_fields(record),
+             record.birthday.value if record.birthday else None)
+            for record in self.contacts.values()
+        )
+
+    def _add_to_index(self, kind, name, fields, birth_date):
+        if kind == "columns":
+            self.column_store.add(name, fields, birth_date)
+        elif kind == "ngram":
+            self.ngram_index.add(name, " ".join(fields))
+        elif kind == "birthday":
+            self.birthday_index.add(name, birth_date)
+        else:
+            self.fuzzy_index.add(name, fields)
+
+    def _index_contact(self, record: Record):
+        # Indexes not built yet pick the record up when they are
+        if not self._built_indexes:
+            return
+        fields = self.search_service.collect_fields(record)
+        birth_date = record.birthday.value if record.birthday else None
+        for kind in self._built_indexes:
+            self._add_to_index(kind, record.name.value, fields, birth_date)
+
+    def _unindex_contact(self, name: str):
+        indexes = {
+            "columns": self.column_store, "ngram": self.ngram_index,
+            "birthday": self.birthday_index, "fuzzy": self.fuzzy_index,
+        }
+        for kind in self._built_indexes:
+            indexes[kind].remove(name)
 
     def add_contact(self, record: Record):
         """Add a new contact or update existing one"""
         self.contacts[record.name.value] = record
+        self._index_contact(record)
+        self._notify("contact_saved", record)
+
+    def update_contact(self, record: Record):
+        """Refresh indexes after fields of a stored contact were edited"""
+        if record.name.value in self.contacts:
+            self._index_contact(record)
+            self._notify("contact_saved", record)
 
     def find_contact(self, name: str) -> Record:
         """Find a contact by name"""
@@ -24,6 +224,8 @@ class ContactRepository:
         """Delete a contact by name"""
         if name in self.contacts:
             del self.contacts[name]
+            self._unindex_contact(name)
+            self._notify("contact_deleted", name)
             return True
         return False
 
@@ -31,90 +233,201 @@ class ContactRepository:
         """Get all contacts"""
         return list(self.contacts.values())
 
+    def iter_contacts(self):
+        """Every contact in order, one at a time
+
+        Lazily loaded books hand records out without keeping them loaded.
+        """
+        records = getattr(self.contacts, "records", None)
+        if records is not None:
+            return records()
+        return iter(self.contacts.values())
+
+    def contact_count(self) -> int:
+        return len(self.contacts)
+
     def has_contact(self, name: str) -> bool:
         """Check if contact exists"""
         return name in self.contacts
 
+    def birthday_candidates(self, start, days: int):
+        """Contacts whose birthday may fall within days after start"""
+        self._ensure_index("birthday")
+        return [self.contacts[name] for name in self.birthday_index.in_window(start, days)]
+
+    def birthday_columns(self, start, days: int):
+        """(names, months, days, years) of contacts that may be born within days after start
+
+        The columnar store hands out its own columns for every contact;
+        otherwise only the birth dates of birthday_candidates() are packed.
+        """
+        if self.column_store is not None:
+            self._ensure_index("birthday")
+            return self.column_store.columns()
+
+        records = self.birthday_candidates(start, days)
+        names = [record.name.value for record in records]
+        birth_dates = [record.birthday.value for record in records]
+        months = array("B", [birth_date.month for birth_date in birth_dates])
+        birth_days = array("B", [birth_date.day for birth_date in birth_dates])
+        years = array("H", [birth_date.year for birth_date in birth_dates])
+        return names, months, birth_days, years
+
+    def contacts_born_on(self, month: int, day: int):
+        """Contacts with a birthday on the given month and day"""
+        self._ensure_index("birthday")
+        return [self.contacts[name] for name in self.birthday_index.on_day(month, day)]
+
     def search_contacts(self, query: str):
-        return self.search_service.exact_search(self.contacts, query)
+        self._ensure_index("ngram")
+        return self.search_service.exact_search(self.contacts, query, self.ngram_index)
 
     def search_closest_contacts(self, query: str):
-        return self.search_service.fuzzy_search(self.contacts, query)
+        self._ensure_index("fuzzy")
+        return self.search_service.fuzzy_search(self.contacts, query, index=self.fuzzy_index)
 
     # --- Notes ---
+    @property
+    def notes(self):
+        """Every note, in the order they were added (a new list on each access)"""
+        return list(self._notes.values())
+
+    @notes.setter
+    def notes(self, notes):
+        notes = list(notes)
+        # Storage backends hand over whole note lists: IDs the notes carry
+        # are kept, missing or clashing ones are numbered after the highest
+        taken = set()
+        for note in notes:
+            note_id = getattr(note, "id", None)
+            if isinstance(note_id, int) and note_id > 0 and note_id not in taken:
+                taken.add(note_id)
+            else:
+                note.id = None
+        self._next_note_id = max(taken, default=0) + 1
+        self._notes = {}
+        for note in notes:
+            self._store_note(note)
+        self.tag_index = self.note_index = None
+
+    def iter_notes(self):
+        """Every note in the order they were added, one at a time"""
+        return iter(self._notes.values())
+
+    def note_matches(self, query=""):
+        """Notes matching query, best first; every note when the query is empty"""
+        if not query:
+            return self.iter_notes()
+        # Words of text and tags, matched by prefix: AND by default, OR between alternatives
+        _, note_index = self._note_indexes()
+        return note_index.search(query)
+
+    def get_note(self, note_id):
+        """The note with this ID, or None"""
+        return self._notes.get(note_id)
+
+    def _store_note(self, note):
+        if note.id is None:
+            note.id = self._next_note_id
+        self._next_note_id = max(self._next_note_id, note.id + 1)
+        self._notes[note.id] = note
+
+    def _has_note(self, note) -> bool:
+        return self._notes.get(getattr(note, "id", None)) is note
+
+    def _note_indexes(self):
+        """(tag index, full-text index) of the notes, built on first use"""
+        if self.tag_index is None:
+            notes = self.notes
+            self.tag_index = TagIndex(notes)
+            self.note_index = NoteIndex(notes)
+        return self.tag_index, self.note_index
+
+    def _live_note_indexes(self):
+        """The note indexes if they are built, else ()"""
+        if self.tag_index is not None:
+            return self.tag_index, self.note_index
+        return ()
+
     def add_note(self, note):
-        self.notes.append(note)
+        # A note copied over from another repository (or replayed from a
+        # journal) keeps its ID while it is free
+        note_id = note.id
+        if not isinstance(note_id, int) or note_id < 1 or note_id in self._notes:
+            note.id = None
+        self._store_note(note)
+        for index in self._live_note_indexes():
+            index.add(note)
+        self._notify("note_added", note)
         return self.format_notes(note, Presenter.success(" Note added:"))
 
     def del_note(self, note):
-        if note not in self.notes:
+        if not self._has_note(note):
             return "Note not found."
 
-        deleted_text = note.text
-
-        self.notes.remove(note)
+        del self._notes[note.id]
+        for note_index in self._live_note_indexes():
+            note_index.remove(note)
+        self._notify("note_deleted", (note.id, note))
 
         return self.format_notes(note, Presenter.success(" Note deleted:"))
 
-    def find_note(self, query):
-        query = query.lower().strip()
-
-        for note in self.notes:
-            if query in note.text.lower() or any(query in tag.lower() for tag in note.tags):
-                return note
-
-        return None
-
-    def search_notes(self, query=""):
-        header = f"Notes matching filter: {query}" if query else " All notes"
-
-        if not query:
-            res = self.notes
-        else:
-            query = query.lower().strip()
-            res = [
-                note for note in self.notes
-                if query in note.text.lower() or any(query in tag.lower() for tag in note.tags)
-            ]
-
-        return (res, self.format_notes(res, header))
-
     def format_notes(self, notes, header=""):
-        if notes is None or (isinstance(notes, list) and not notes):
-            return " No notes to show."
-
         if isinstance(notes, Note):
             notes = [notes]
+        return "\n".join(self.note_lines(notes or (), header))
 
-        lines = []
+    def note_lines(self, notes, header=""):
+        """The lines of format_notes one at a time, for notes from any iterable"""
+        notes = iter(notes)
+        first = next(notes, None)
+        if first is None:
+            yield " No notes to show."
+            return
 
         if header:
-            lines.append(header)
-
-        if len(notes) == 1:
-            lines.append(str(notes[0]))
-        else:
-            for i, note in enumerate(notes, start=1):
-                lines.append(f"{i}. {str(note)}")
+            yield header
+        # The ID is what note-del and note-edit ask for
+        yield self._note_line(first)
+        for note in notes:
+            yield self._note_line(note)
 
-        return "\n".join(lines)
+    @staticmethod
+    def _note_line(note):
+        return f"#{note.id} {note}" if note.id is not None else str(note)
 
     def edit_note(self, note, new_text=None, new_tags=None):
-        if note not in self.notes:
+        if not self._has_note(note):
             return "Note not found."
 
         if new_text is not None and len(new_text) > 0:
             note.text = new_text
 
+        old_tags = note.tags
         if new_tags is not None and len(new_tags) > 0:
             note.tags = new_tags
 
+        indexes = self._live_note_indexes()
+        if indexes:
+            tag_index, note_index = indexes
+            tag_index.retag(note, old_tags)
+            note_index.add(note)
+
+        self._notify("note_edited", (note.id, note))
         return self.format_notes(note, Presenter.success(' Note updated:'))
 
     def notes_by_tags(self, notes=None):
-        if not notes:
-            notes = self.notes
+        if notes:
+            tag_map, no_tag_notes = self._group_by_tags(notes)
+            return self._format_tag_groups(tag_map, no_tag_notes)
 
+        # All notes: the tag index already holds the groups
+        tag_index, _ = self._note_indexes()
+        tag_map = {tag: tag_index.notes_with(tag) for tag in tag_index.tags()}
+        return self._format_tag_groups(tag_map, tag_index.untagged())
+
+    @staticmethod
+    def _group_by_tags(notes):
         tag_map = defaultdict(list)
         no_tag_notes = []
 
@@ -125,18 +438,22 @@ class ContactRepository:
             else:
                 no_tag_notes.append(note)
 
+        return tag_map, no_tag_notes
+
+    @classmethod
+    def _format_tag_groups(cls, tag_map, no_tag_notes):
         output_lines = []
 
         for tag in sorted(tag_map.keys()):
             output_lines.append(f"Tag: {tag}")
             for note in tag_map[tag]:
-                output_lines.append(f"  {note}")
+                output_lines.append(f"  {cls._note_line(note)}")
             output_lines.append("")  # пустая строка между тегами
 
         if no_tag_notes:
             output_lines.append("No tags:")
             for note in no_tag_notes:
-                output_lines.append(f"  {note}")
+                output_lines.append(f"  {cls._note_line(note)}")
 
         if output_lines:
             return "\n".join(output_lines)
@@ -0,0 +1,72 @@
+"""Contacts mapping that materializes records on first access."""
+
+from collections.abc import MutableMapping
+
+
+class ContactStub:
+    """Where a not yet loaded record lives, plus what the indexes need to know about it."""
+
+    __slots__ = ("offset", "length", "search_keys", "birth_date")
+
+    def __init__(self, offset: int, length: int, search_keys: tuple, birth_date=None):
+        self.offset = offset
+        self.length = length
+        self.search_keys = search_keys
+        self.birth_date = birth_date
+
+
+class LazyContacts(MutableMapping):
+    """Name -> Record mapping whose values start out as stubs.
+
+    Membership, iteration over names and ``len`` never load anything;
+    looking a name up loads that single record through ``loader(stub)``.
+    Walking ``values()``/``items()`` therefore materializes the whole book.
+    """
+
+    def __init__(self, stubs: dict, loader):
+        self._entries = dict(stubs)
+        self._loader = loader
+
+    def __getitem__(self, name):
+        entry = self._entries[name]
+        if isinstance(entry, ContactStub):
+            entry = self._loader(entry)
+            self._entries[name] = entry
+        return entry
+
+    def __setitem__(self, name, record):
+        self._entries[name] = record
+
+    def __delitem__(self, name):
+        del self._entries[name]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __reduce__(self):
+        # Pickling outside the paged format needs the real records
+        return (dict, (list(self.items()),))
+
+    def stub(self, name):
+        """The stub stored under name, or None once the record is loaded."""
+        entry = self._entries[name]
+        return entry if isinstance(entry, ContactStub) else None
+
+    def records(self):
+        """Every record in order; stubs are loaded for the caller but stay stubs here."""
+        for entry in self._entries.values():
+            yield self._loader(entry) if isinstance(entry, ContactStub) else entry
+
+    def summaries(self):
+        """(name, search keys, birth date) of every contact without loading stubs."""
+        for name, entry in self._entries.items():
+            if isinstance(entry, ContactStub):
+                yield name, entry.search_keys, entry.birth_date
+            else:
+                yield name, entry.search_keys, entry.birthday.value if entry.birthday else None
@@ -0,0 +1,514 @@
+"""ContactRepository backed by SQLite.
+
+Contacts and notes live in normalized tables and are only materialized into
+``Record``/``Note`` objects when a command needs them; contact searches, tag
+listings, birthday windows and note searches run as SQL queries, the
+searches through FTS5 tables when SQLite has them. Objects materialized so
+far are kept by name/row id, so repeated lookups return the same instance.
+"""
+
+import json
+import sqlite3
+
+from cli.presenter import Presenter
+from models.contact import Record
+from models.note import Note
+from repositories.birthday_index import window_days
+from repositories.contact_repository import ContactRepository
+from search.note_index import parse_query
+from search.search_service import FUZZY_THRESHOLD
+from storage.record_codec import build_record, parse_birthday
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    address TEXT,
+    birthday TEXT,
+    birth_month INTEGER,
+    birth_day INTEGER,
+    search_text TEXT NOT NULL,
+    search_fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS phones (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS emails (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_phones_contact ON phones(contact_id);
+CREATE INDEX IF NOT EXISTS idx_emails_contact ON emails(contact_id);
+CREATE INDEX IF NOT EXISTS idx_contacts_birthday ON contacts(birth_month, birth_day);
+CREATE INDEX IF NOT EXISTS idx_note_tags_note ON note_tags(note_id);
+CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags(tag);
+-- Created by earlier versions, no query looks values up
+DROP INDEX IF EXISTS idx_phones_value;
+DROP INDEX IF EXISTS idx_emails_value;
+"""
+
+# Trigram full-text index over contacts.search_text, kept in step by triggers.
+# Needs FTS5 and SQLite 3.34+ for the trigram tokenizer.
+CONTACT_SEARCH_SCHEMA = """
+BEGIN;
+CREATE VIRTUAL TABLE contacts_search USING fts5(
+    search_text, content='contacts', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER contacts_search_insert AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_search (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER contacts_search_delete AFTER DELETE ON contacts BEGIN
+    INSERT INTO contacts_search (contacts_search, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+END;
+CREATE TRIGGER contacts_search_update AFTER UPDATE OF search_text ON contacts BEGIN
+    INSERT INTO contacts_search (contacts_search, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    INSERT INTO contacts_search (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+INSERT INTO contacts_search (contacts_search) VALUES ('rebuild');
+COMMIT;
+"""
+
+# Word index over note texts and tags for ranked prefix searches. Words are
+# split like search.note_index.tokenize: case folded, accents kept, "_" inside words.
+NOTE_SEARCH_SCHEMA = """
+BEGIN;
+CREATE VIRTUAL TABLE notes_search USING fts5(
+    text, tags, tokenize="unicode61 remove_diacritics 0 tokenchars '_'"
+);
+CREATE TRIGGER notes_search_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_search (rowid, text, tags) VALUES (new.id, new.text, '');
+END;
+CREATE TRIGGER notes_search_delete AFTER DELETE ON notes BEGIN
+    DELETE FROM notes_search WHERE rowid = old.id;
+END;
+CREATE TRIGGER notes_search_update AFTER UPDATE OF text ON notes BEGIN
+    UPDATE notes_search SET text = new.text WHERE rowid = new.id;
+END;
+CREATE TRIGGER notes_search_tag_insert AFTER INSERT ON note_tags BEGIN
+    UPDATE notes_search SET tags = (
+        SELECT group_concat(tag, ' ') FROM note_tags WHERE note_id = new.note_id
+    ) WHERE rowid = new.note_id;
+END;
+CREATE TRIGGER notes_search_tag_delete AFTER DELETE ON note_tags BEGIN
+    UPDATE notes_search SET tags = coalesce((
+        SELECT group_concat(tag, ' ') FROM note_tags WHERE note_id = old.note_id
+    ), '') WHERE rowid = old.note_id;
+END;
+INSERT INTO notes_search (rowid, text, tags)
+    SELECT n.id, n.text, coalesce((SELECT group_concat(tag, ' ') FROM note_tags t WHERE t.note_id = n.id), '')
+    FROM notes n;
+COMMIT;
+"""
+
+# Keep IN (...) lists under SQLite's host parameter limit
+_BATCH_SIZE = 500
+
+
+def ensure_schema(connection: sqlite3.Connection) -> tuple[bool, bool]:
+    """Create what is missing; (contacts, notes) flags telling which have their search table."""
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    return (
+        _ensure_virtual_table(connection, "contacts_search", CONTACT_SEARCH_SCHEMA),
+        _ensure_virtual_table(connection, "notes_search", NOTE_SEARCH_SCHEMA),
+    )
+
+
+def _ensure_virtual_table(connection: sqlite3.Connection, name: str, script: str) -> bool:
+    if connection.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone():
+        return True
+    try:
+        # Also indexes the rows already there, for databases of earlier versions
+        connection.executescript(script)
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5 (or too old for the tokenizer): queries scan instead
+        if connection.in_transaction:
+            connection.rollback()
+        return False
+    return True
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class SQLiteContactRepository(ContactRepository):
+    def __init__(self, connection: sqlite3.Connection):
+        super().__init__()
+        self.connection = connection
+        self._notes_by_id = {}
+        self._note_ids = {}
+        self._fuzzy_loaded = False
+        self._contact_search, self._note_search = ensure_schema(connection)
+
+    def __getstate__(self):
+        raise TypeError("SQLite-backed repository is persisted by its database")
+
+    def rebuild_indexes(self):
+        """SQLite indexes are maintained by the database itself"""
+        self._fuzzy_loaded = False
+
+    def use_columnar(self, enabled: bool = True):
+        """The database answers substring and birthday queries itself; there is no store to scan"""
+        self.columnar = False
+
+    # --- Contacts ---
+    def add_contact(self, record: Record):
+        """Add a new contact or update existing one"""
+        self._write_contact(record)
+        self.contacts[record.name.value] = record
+        self._notify("contact_saved", record)
+
+    def update_contact(self, record: Record):
+        """Write edited fields of a stored contact back to the database"""
+        if self.has_contact(record.name.value):
+            self.add_contact(record)
+
+    def find_contact(self, name: str) -> Record:
+        """Find a contact by name"""
+        record = self.contacts.get(name)
+        if record is None:
+            records = self._query_contacts("WHERE c.name = ?", (name,))
+            record = records[0] if records else None
+        return record
+
+    def delete_contact(self, name: str):
+        """Delete a contact by name"""
+        cursor = self.connection.execute("DELETE FROM contacts WHERE name = ?", (name,))
+        self.connection.commit()
+        self.contacts.pop(name, None)
+        if self._fuzzy_loaded:
+            self.fuzzy_index.remove(name)
+        if cursor.rowcount:
+            self._notify("contact_deleted", name)
+            return True
+        return False
+
+    def get_all_contacts(self):
+        """Get all contacts"""
+        return self._query_contacts()
+
+    def iter_contacts(self):
+        """Every contact, read from the database a batch at a time and not kept"""
+        last_id = 0
+        while True:
+            rows = self.connection.execute(
+                "SELECT c.id, c.name, c.address, c.birthday FROM contacts c "
+                "WHERE c.id > ? ORDER BY c.id LIMIT ?",
+                (last_id, _BATCH_SIZE),
+            ).fetchall()
+            if not rows:
+                return
+            yield from self._build_contacts(rows, keep=False)
+            last_id = rows[-1][0]
+
+    def contact_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def has_contact(self, name: str) -> bool:
+        """Check if contact exists"""
+        row = self.connection.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def search_contacts(self, query: str):
+        query = query.lower()
+        if self._contact_search and len(query) >= 3:
+            # A quoted phrase of trigrams matches exactly the texts containing query
+            phrase = '"' + query.replace('"', '""') + '"'
+            return self._query_contacts(
+                "WHERE c.id IN (SELECT rowid FROM contacts_search WHERE contacts_search MATCH ?)", (phrase,)
+            )
+        return self._query_contacts("WHERE c.search_text LIKE ? ESCAPE '\\'", (_like_pattern(query),))
+
+    def search_closest_contacts(self, query: str):
+        if not self._fuzzy_loaded:
+            for name, fields in self.connection.execute("SELECT name, search_fields FROM contacts ORDER BY id"):
+                self.fuzzy_index.add(name, json.loads(fields))
+            self._fuzzy_loaded = True
+
+        names = self.fuzzy_index.search(query.lower(), 5, FUZZY_THRESHOLD)
+        return [self.find_contact(name) for name in names]
+
+    def birthday_candidates(self, start, days: int):
+        """Contacts whose birthday may fall within days after start"""
+        pairs = list(window_days(start, days))
+        records = []
+        for i in range(0, len(pairs), _BATCH_SIZE):
+            batch = pairs[i:i + _BATCH_SIZE]
+            placeholders = ", ".join("(?, ?)" for _ in batch)
+            params = [value for pair in batch for value in pair]
+            records.extend(self._query_contacts(
+                f"WHERE (c.birth_month, c.birth_day) IN (VALUES {placeholders})", params
+            ))
+        return records
+
+    def contacts_born_on(self, month: int, day: int):
+        """Contacts with a birthday on the given month and day"""
+        return self._query_contacts("WHERE c.birth_month = ? AND c.birth_day = ?", (month, day))
+
+    def _write_contact(self, record: Record):
+        fields = list(record.search_keys)
+        birth_date = record.birthday.value if record.birthday else None
+        values = (
+            record.address.value if record.address else None,
+            str(record.birthday) if record.birthday else None,
+            birth_date.month if birth_date else None,
+            birth_date.day if birth_date else None,
+            " ".join(fields),
+            json.dumps(fields, ensure_ascii=False),
+        )
+
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT id FROM contacts WHERE name = ?", (record.name.value,)
+            ).fetchone()
+            if row is None:
+                contact_id = self.connection.execute(
+                    "INSERT INTO contacts (address, birthday, birth_month, birth_day, search_text, "
+                    "search_fields, name) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    values + (record.name.value,),
+                ).lastrowid
+            else:
+                # Update in place so the contact keeps its position in listings
+                contact_id = row[0]
+                self.connection.execute(
+                    "UPDATE contacts SET address = ?, birthday = ?, birth_month = ?, birth_day = ?, "
+                    "search_text = ?, search_fields = ? WHERE id = ?",
+                    values + (contact_id,),
+                )
+                self.connection.execute("DELETE FROM phones WHERE contact_id = ?", (contact_id,))
+                self.connection.execute("DELETE FROM emails WHERE contact_id = ?", (contact_id,))
+
+            self.connection.executemany(
+                "INSERT INTO phones (contact_id, position, value) VALUES (?, ?, ?)",
+                [(contact_id, i, p.value) for i, p in enumerate(record.phones)],
+            )
+            self.connection.executemany(
+                "INSERT INTO emails (contact_id, position, value) VALUES (?, ?, ?)",
+                [(contact_id, i, e.value) for i, e in enumerate(record.emails)],
+            )
+
+        if self._fuzzy_loaded:
+            self.fuzzy_index.add(record.name.value, fields)
+
+    def _query_contacts(self, where: str = "", params=()):
+        """Materialize the contacts matched by where, reusing already loaded records"""
+        rows = self.connection.execute(
+            f"SELECT c.id, c.name, c.address, c.birthday FROM contacts c {where} ORDER BY c.id",
+            params,
+        ).fetchall()
+
+        return self._build_contacts(rows)
+
+    def _build_contacts(self, rows, keep: bool = True):
+        """Records of contact rows; new ones are cached in self.contacts if keep"""
+        missing = [row for row in rows if row[1] not in self.contacts]
+        phones = self._children("phones", [row[0] for row in missing])
+        emails = self._children("emails", [row[0] for row in missing])
+
+        built = {}
+        for contact_id, name, address, birthday in missing:
+            # Rows were validated on the way in, rebuild without re-validating
+            built[name] = build_record(
+                name,
+                phones.get(contact_id, ()),
+                emails.get(contact_id, ()),
+                address,
+                parse_birthday(birthday) if birthday else None,
+            )
+        if keep:
+            self.contacts.update(built)
+
+        return [built[name] if name in built else self.contacts[name] for _, name, _, _ in rows]
+
+    def _children(self, table: str, contact_ids):
+        values = {}
+        for i in range(0, len(contact_ids), _BATCH_SIZE):
+            batch = contact_ids[i:i + _BATCH_SIZE]
+            placeholders = ", ".join("?" for _ in batch)
+            for contact_id, value in self.connection.execute(
+                f"SELECT contact_id, value FROM {table} WHERE contact_id IN ({placeholders}) "
+                "ORDER BY contact_id, position",
+                batch,
+            ):
+                values.setdefault(contact_id, []).append(value)
+        return values
+
+    # --- Notes ---
+    @property
+    def notes(self):
+        """Every note, read from the database (a new list on each access)"""
+        return list(self.iter_notes())
+
+    @notes.setter
+    def notes(self, notes):
+        # Only ContactRepository.__init__ assigns here; stored notes live in the database
+        ContactRepository.notes.fset(self, notes)
+
+    def add_note(self, note):
+        # A note copied over from another repository keeps its ID while it is free
+        note_id = note.id
+        if note_id is not None and self.connection.execute(
+            "SELECT 1 FROM notes WHERE id = ?", (note_id,)
+        ).fetchone():
+            note_id = None
+        with self.connection:
+            note_id = self.connection.execute(
+                "INSERT INTO notes (id, text) VALUES (?, ?)", (note_id, note.text)
+            ).lastrowid
+            self._write_tags(note_id, note.tags)
+        self._remember_note(note_id, note)
+        for index in self._live_note_indexes():
+            index.add(note)
+        self._notify("note_added", note)
+        return self.format_notes(note, Presenter.success(" Note added:"))
+
+    def del_note(self, note):
+        note_id = self._note_ids.get(id(note))
+        if note_id is None:
+            return "Note not found."
+
+        with self.connection:
+            self.connection.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        self._forget_note(note_id, note)
+        for index in self._live_note_indexes():
+            index.remove(note)
+        self._notify("note_deleted", (note_id, note))
+        return self.format_notes(note, Presenter.success(" Note deleted:"))
+
+    def edit_note(self, note, new_text=None, new_tags=None):
+        note_id = self._note_ids.get(id(note))
+        if note_id is None:
+            return "Note not found."
+
+        if new_text is not None and len(new_text) > 0:
+            note.text = new_text
+
+        old_tags = note.tags
+        if new_tags is not None and len(new_tags) > 0:
+            note.tags = new_tags
+
+        with self.connection:
+            self.connection.execute("UPDATE notes SET text = ? WHERE id = ?", (note.text, note_id))
+            self.connection.execute("DELETE FROM note_tags WHERE note_id = ?", (note_id,))
+            self._write_tags(note_id, note.tags)
+        indexes = self._live_note_indexes()
+        if indexes:
+            tag_index, note_index = indexes
+            tag_index.retag(note, old_tags)
+            note_index.add(note)
+        self._notify("note_edited", (note_id, note))
+        return self.format_notes(note, Presenter.success(" Note updated:"))
+
+    def get_note(self, note_id):
+        """The note with this ID, or None"""
+        note = self._notes_by_id.get(note_id)
+        if note is None:
+            notes = self._query_notes("WHERE n.id = ?", (note_id,))
+            note = notes[0] if notes else None
+        return note
+
+    def note_matches(self, query=""):
+        """Notes matching query, best first; every note when the query is empty"""
+        if not query or not self._note_search:
+            # Without FTS5 the inherited word index is built from the notes table
+            return super().note_matches(query)
+        groups = parse_query(query)
+        if not groups:
+            return []
+        # Prefix terms, AND within an alternative and OR between them, as NoteIndex reads them
+        match = " OR ".join(
+            "(" + " AND ".join(f'"{term}"*' for term in group) + ")" for group in groups
+        )
+        return self._query_notes(
+            "JOIN notes_search s ON s.rowid = n.id WHERE notes_search MATCH ?", (match,),
+            order="bm25(notes_search), n.id",
+        )
+
+    def iter_notes(self):
+        """Every note, read from the database a batch at a time"""
+        last_id = 0
+        while True:
+            notes = self._query_notes("WHERE n.id > ?", (last_id,), _BATCH_SIZE)
+            yield from notes
+            if len(notes) < _BATCH_SIZE:
+                return
+            last_id = notes[-1].id
+
+    def notes_by_tags(self, notes=None):
+        if notes:
+            return super().notes_by_tags(notes)
+
+        rows = self.connection.execute(
+            "SELECT t.tag, t.note_id FROM note_tags t ORDER BY t.tag, t.note_id"
+        ).fetchall()
+        untagged = self._query_notes(
+            "WHERE NOT EXISTS (SELECT 1 FROM note_tags t WHERE t.note_id = n.id)"
+        )
+        loaded = {self._note_ids[id(note)]: note for note in self._query_notes(
+            "WHERE EXISTS (SELECT 1 FROM note_tags t WHERE t.note_id = n.id)"
+        )}
+
+        tag_map = {}
+        for tag, note_id in rows:
+            tag_map.setdefault(tag, []).append(loaded[note_id])
+
+        return self._format_tag_groups(tag_map, untagged)
+
+    def _query_notes(self, where: str = "", params=(), limit: int = -1, order: str = "n.id"):
+        rows = self.connection.execute(
+            f"SELECT n.id, n.text FROM notes n {where} ORDER BY {order} LIMIT ?",
+            tuple(params) + (limit,),
+        ).fetchall()
+
+        tags = self._note_tags([note_id for note_id, _ in rows if note_id not in self._notes_by_id])
+        notes = []
+        for note_id, text in rows:
+            note = self._notes_by_id.get(note_id)
+            if note is None:
+                note = Note(text, tags.get(note_id))
+                self._remember_note(note_id, note)
+            notes.append(note)
+        return notes
+
+    def _note_tags(self, note_ids):
+        tags = {}
+        for i in range(0, len(note_ids), _BATCH_SIZE):
+            batch = note_ids[i:i + _BATCH_SIZE]
+            placeholders = ", ".join("?" for _ in batch)
+            for note_id, tag in self.connection.execute(
+                f"SELECT note_id, tag FROM note_tags WHERE note_id IN ({placeholders}) "
+                "ORDER BY note_id, position",
+                batch,
+            ):
+                tags.setdefault(note_id, []).append(tag)
+        return tags
+
+    def _remember_note(self, note_id: int, note: Note):
+        # _notes_by_id keeps notes alive, so id(note) stays unique while it maps to a row
+        note.id = note_id
+        self._notes_by_id[note_id] = note
+        self._note_ids[id(note)] = note_id
+
+    def _forget_note(self, note_id: int, note: Note):
+        del self._notes_by_id[note_id]
+        del self._note_ids[id(note)]
+
+    def _write_tags(self, note_id: int, tags):
+        self.connection.executemany(
+            "INSERT INTO note_tags (note_id, position, tag) VALUES (?, ?, ?)",
+            [(note_id, i, tag) for i, tag in enumerate(tags)],
+        )
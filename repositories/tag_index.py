@@ -0,0 +1,82 @@
+"""Tag index: notes grouped by tag, with the tags kept in sorted order."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+
+
+class TagIndex:
+    """Keeps one group of notes per tag, each group in the order notes were added.
+
+    Notes are tracked by identity. Building the index from the note list
+    and then calling add() for every new note keeps each group in list
+    order; a note that gains a tag while being edited is put back in its
+    place when the group is read (sorting a group that is already in order
+    is linear).
+    """
+
+    def __init__(self, notes=()) -> None:
+        self._groups: dict[str, dict] = {}
+        self._tags: list[str] = []
+        self._untagged: dict = {}
+        # Position of every note in add order, used to restore group order
+        self._position: dict = {}
+        self._next_position = 0
+        for note in notes:
+            self.add(note)
+
+    def __len__(self) -> int:
+        return len(self._position)
+
+    def add(self, note) -> None:
+        self._position[note] = self._next_position
+        self._next_position += 1
+        self._link(note, note.tags)
+
+    def remove(self, note) -> None:
+        if note not in self._position:
+            return
+        self._unlink(note, note.tags)
+        del self._position[note]
+
+    def retag(self, note, old_tags) -> None:
+        """Move note from the groups of old_tags to the groups of its current tags."""
+        if note not in self._position:
+            return
+        self._unlink(note, old_tags)
+        self._link(note, note.tags)
+
+    def tags(self) -> list[str]:
+        """Every tag in use, sorted."""
+        return self._tags
+
+    def notes_with(self, tag: str) -> list:
+        """Notes carrying tag, in note list order."""
+        return sorted(self._groups.get(tag, ()), key=self._position.__getitem__)
+
+    def untagged(self) -> list:
+        """Notes without tags, in note list order."""
+        return sorted(self._untagged, key=self._position.__getitem__)
+
+    def _link(self, note, tags) -> None:
+        if not tags:
+            self._untagged[note] = None
+            return
+        for tag in tags:
+            group = self._groups.get(tag)
+            if group is None:
+                group = self._groups[tag] = {}
+                insort(self._tags, tag)
+            group[note] = None
+
+    def _unlink(self, note, tags) -> None:
+        if not tags:
+            self._untagged.pop(note, None)
+            return
+        for tag in tags:
+            group = self._groups.get(tag)
+            if group is None or group.pop(note, False) is False:
+                continue
+            if not group:
+                del self._groups[tag]
+                del self._tags[bisect_left(self._tags, tag)]
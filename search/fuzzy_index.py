@@ -0,0 +1,165 @@
+# search/fuzzy_index.py
+"""Candidate-pruned fuzzy matching over the searchable fields of contacts.
+
+Scores are ``difflib.SequenceMatcher(None, query, field).ratio()``, exactly
+what the unindexed search computes, so results and ranking are the same.
+That ratio never exceeds the normalized indel ratio ``2 * LCS / (len(a) +
+len(b))``, which in turn is bounded by the lengths and the shared character
+counts. Fields are bucketed by length so whole buckets are skipped by the
+length bound, the remaining ones are filtered by shared character counts,
+then by the (bit-parallel) LCS bound, and only survivors get scored.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from difflib import SequenceMatcher
+
+
+class FuzzyIndex:
+    """Length-bucketed store of contact fields answering top-k similarity queries."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[int, dict[str, set[str]]] = {}
+        self._fields: dict[str, tuple[str, ...]] = {}
+        self._order: dict[str, int] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fields
+
+    def add(self, key: str, fields) -> None:
+        """Index (or re-index) the fields stored under key."""
+        fields = tuple(dict.fromkeys(field for field in fields if field))
+        old_fields = self._fields.get(key)
+        if old_fields == fields:
+            return
+
+        if old_fields is not None:
+            self._drop_fields(key, old_fields)
+        else:
+            self._order[key] = self._next_seq
+            self._next_seq += 1
+
+        self._fields[key] = fields
+        for field in fields:
+            bucket = self._buckets.setdefault(len(field), {})
+            bucket.setdefault(field, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Forget every field indexed under key."""
+        fields = self._fields.pop(key, None)
+        if fields is None:
+            return
+        self._drop_fields(key, fields)
+        del self._order[key]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._fields.clear()
+        self._order.clear()
+        self._next_seq = 0
+
+    def search(self, query: str, limit: int, threshold: float) -> list[str]:
+        """Return up to limit keys scoring at least threshold, best first."""
+        m = len(query)
+        if not m or limit <= 0:
+            return []
+
+        query_counts = Counter(query)
+        matcher = SequenceMatcher(None, query)
+        masks = self._char_masks(query)
+        all_bits = (1 << m) - 1
+
+        best: dict[str, float] = {}
+        top: list[tuple[float, int, str]] = []  # min-heap of (score, -seq, key)
+
+        def cutoff() -> float:
+            return top[0][0] if len(top) >= limit else threshold
+
+        # Visit lengths with the most promising upper bound first so the
+        # top-k cutoff rises quickly and prunes the remaining buckets
+        bounds = sorted(
+            ((2 * min(m, length) / (m + length), length) for length in self._buckets),
+            reverse=True,
+        )
+
+        for length_bound, length in bounds:
+            if length_bound < cutoff():
+                break
+            total = m + length
+
+            for field, keys in self._buckets[length].items():
+                common = sum(
+                    min(count, query_counts[char])
+                    for char, count in Counter(field).items()
+                    if char in query_counts
+                )
+                if 2 * common / total < cutoff():
+                    continue
+
+                if 2 * self._lcs_length(masks, all_bits, m, field) / total < cutoff():
+                    continue
+
+                matcher.set_seq2(field)
+                score = matcher.ratio()
+                if score < cutoff():
+                    continue
+
+                for key in keys:
+                    if score <= best.get(key, 0.0):
+                        continue
+                    best[key] = score
+                    self._offer(top, limit, (score, -self._order[key], key))
+
+        top.sort(reverse=True)
+        return [key for _, _, key in top]
+
+    @staticmethod
+    def _offer(top: list, limit: int, entry: tuple) -> None:
+        """Keep the limit best distinct keys in the heap."""
+        key = entry[2]
+        for i, current in enumerate(top):
+            if current[2] == key:
+                top[i] = entry
+                heapq.heapify(top)
+                return
+
+        if len(top) < limit:
+            heapq.heappush(top, entry)
+        elif entry > top[0]:
+            heapq.heapreplace(top, entry)
+
+    @staticmethod
+    def _char_masks(query: str) -> dict[str, int]:
+        masks: dict[str, int] = {}
+        for i, char in enumerate(query):
+            masks[char] = masks.get(char, 0) | (1 << i)
+        return masks
+
+    @staticmethod
+    def _lcs_length(masks: dict[str, int], all_bits: int, m: int, text: str) -> int:
+        """Bit-parallel LCS length (Hyyro), one big-int step per character."""
+        v = all_bits
+        for char in text:
+            u = v & masks.get(char, 0)
+            v = ((v + u) | (v - u)) & all_bits
+        return m - bin(v).count("1")
+
+    def _drop_fields(self, key: str, fields) -> None:
+        for field in fields:
+            bucket = self._buckets.get(len(field))
+            if bucket is None:
+                continue
+            keys = bucket.get(field)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del bucket[field]
+            if not bucket:
+                del self._buckets[len(field)]
@@ -0,0 +1,112 @@
+# search/ngram_index.py
+"""Inverted n-gram index used to answer substring queries without a full scan."""
+
+from __future__ import annotations
+
+from array import array
+
+NGRAM_SIZE = 3
+# Queries whose rarest gram occurs in more than this share of the rows scan instead
+SCAN_FRACTION = 0.5
+
+
+class NgramIndex:
+    """Maps every n-gram of a contact's search text to the rows containing it.
+
+    Every key gets a row number in the order it was added and posting lists
+    are compact arrays of rows, so hits come back in add order by sorting
+    integers. Removed rows stay empty until they outnumber the live ones,
+    then the rows are renumbered.
+    """
+
+    def __init__(self, n: int = NGRAM_SIZE) -> None:
+        self.n = n
+        self._postings: dict[str, array] = {}
+        self._keys: list = []                  # row -> key, None once removed
+        self._texts: list = []                 # row -> search text, None once removed
+        self._rows: dict = {}                  # key -> row
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def add(self, key: str, text: str) -> None:
+        """Index (or re-index) the search text stored under key."""
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(text)
+            old_grams = set()
+        else:
+            old_text = self._texts[row]
+            if old_text == text:
+                return
+            old_grams = self._grams(old_text)
+            self._texts[row] = text
+
+        new_grams = self._grams(text)
+        for gram in old_grams - new_grams:
+            self._drop(gram, row)
+        postings = self._postings
+        for gram in new_grams - old_grams:
+            rows = postings.get(gram)
+            if rows is None:
+                rows = postings[gram] = array("I")
+            rows.append(row)
+
+    def remove(self, key: str) -> None:
+        """Forget everything indexed under key."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        for gram in self._grams(self._texts[row]):
+            self._drop(gram, row)
+        self._keys[row] = self._texts[row] = None
+        if len(self._keys) > 2 * len(self._rows) + 64:
+            self._compact()
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._keys.clear()
+        self._texts.clear()
+        self._rows.clear()
+
+    def search(self, query: str) -> list[str]:
+        """Return keys whose text contains query, in the order they were added."""
+        keys = self._keys
+        texts = self._texts
+        if len(query) >= self.n:
+            rarest = None
+            for gram in self._grams(query):
+                rows = self._postings.get(gram)
+                if rows is None:
+                    return []
+                if rarest is None or len(rows) < len(rarest):
+                    rarest = rows
+
+            if len(rarest) <= SCAN_FRACTION * len(self._rows):
+                # Sharing a gram is necessary but not sufficient, verify each hit
+                hits = sorted(row for row in rarest if query in texts[row])
+                return [keys[row] for row in hits]
+
+        # Too short to produce a gram, or matching most of the book anyway
+        return [keys[row] for row, text in enumerate(texts) if text is not None and query in text]
+
+    def _drop(self, gram: str, row: int) -> None:
+        rows = self._postings[gram]
+        rows.remove(row)
+        if not rows:
+            del self._postings[gram]
+
+    def _compact(self) -> None:
+        entries = [(key, text) for key, text in zip(self._keys, self._texts) if key is not None]
+        self.clear()
+        for key, text in entries:
+            self.add(key, text)
+
+    def _grams(self, text: str) -> set[str]:
+        n = self.n
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
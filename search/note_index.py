@@ -0,0 +1,182 @@
+# search/note_index.py
+"""Inverted word index over note texts and tags, ranked with BM25."""
+
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+
+# BM25 term frequency saturation and document length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r"\w+")
+_OR = {"OR", "|"}
+_AND = {"AND", "&"}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased words of text."""
+    return _WORD.findall(text.lower())
+
+
+def parse_query(query: str) -> list[list[str]]:
+    """Split a query into alternatives of terms that must all match.
+
+    Terms are joined with AND by default; ``OR`` (or ``|``) separates
+    alternatives, so ``milk bread OR eggs`` reads (milk AND bread) OR eggs.
+    """
+    groups: list[list[str]] = [[]]
+    for word in query.split():
+        if word in _OR:
+            groups.append([])
+        elif word not in _AND:
+            groups[-1].extend(tokenize(word))
+    return [group for group in groups if group]
+
+
+class NoteIndex:
+    """Maps every word of a note's text and tags to the notes containing it.
+
+    Notes are tracked by identity. Every query term matches the words it
+    is a prefix of; results are ranked by BM25 with ties kept in the order
+    notes were added.
+    """
+
+    def __init__(self, notes=()) -> None:
+        self._postings: dict[str, dict] = {}   # word -> {note: term frequency}
+        self._words: list[str] = []             # sorted, for prefix lookups
+        self._counts: dict = {}                 # note -> Counter of its words
+        self._lengths: dict = {}
+        self._total_length = 0
+        self._order: dict = {}
+        self._next_seq = 0
+        for note in notes:
+            self.add(note)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, note) -> bool:
+        return note in self._counts
+
+    def add(self, note) -> None:
+        """Index (or re-index, after an edit) the text and tags of note."""
+        if note in self._counts:
+            self._drop(note)
+        else:
+            self._order[note] = self._next_seq
+            self._next_seq += 1
+
+        words = tokenize(note.text)
+        for tag in note.tags:
+            words.extend(tokenize(tag))
+        counts = Counter(words)
+
+        self._counts[note] = counts
+        self._lengths[note] = len(words)
+        self._total_length += len(words)
+        for word, count in counts.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                insort(self._words, word)
+            postings[note] = count
+
+    def remove(self, note) -> None:
+        if note not in self._counts:
+            return
+        self._drop(note)
+        del self._order[note]
+
+    def search(self, query: str) -> list:
+        """Notes matching query, best first."""
+        groups = parse_query(query)
+        if not groups:
+            return []
+        scores = self._match_group(groups[0])
+        for group in groups[1:]:
+            # An alternative scores as the best group it matched
+            for note, score in self._match_group(group).items():
+                if score > scores.get(note, 0.0):
+                    scores[note] = score
+
+        # Sorting is stable even in reverse, so equal scores stay in add order
+        notes = sorted(scores, key=self._order.__getitem__)
+        notes.sort(key=scores.__getitem__, reverse=True)
+        return notes
+
+    def _match_group(self, terms: list[str]) -> dict:
+        """Notes containing every term, with their summed BM25 score."""
+        term_postings = [self._expand(term) for term in terms]
+        if not all(term_postings):
+            return {}
+
+        # Intersect starting from the rarest term
+        term_postings.sort(key=lambda postings: sum(len(p) for _, p in postings))
+        candidates = self._notes_of(term_postings[0])
+        for postings in term_postings[1:]:
+            candidates &= self._notes_of(postings)
+            if not candidates:
+                return {}
+
+        note_count = len(self._counts)
+        average_length = self._total_length / note_count
+        lengths = self._lengths
+        # BM25 length normalisation is base + per_word * length
+        base = BM25_K1 * (1 - BM25_B)
+        per_word = BM25_K1 * BM25_B / average_length
+        scores = dict.fromkeys(candidates, 0.0)
+        for postings in term_postings:
+            # A prefix counts once per note, through its best scoring word
+            best: dict = {}
+            for _, word_postings in postings:
+                idf = self._idf(len(word_postings), note_count)
+                if len(word_postings) <= len(candidates):
+                    hits = ((note, f) for note, f in word_postings.items() if note in candidates)
+                else:
+                    hits = ((note, word_postings[note]) for note in candidates if note in word_postings)
+                weight = idf * (BM25_K1 + 1)
+                for note, frequency in hits:
+                    score = weight * frequency / (frequency + base + per_word * lengths[note])
+                    if score > best.get(note, 0.0):
+                        best[note] = score
+            for note, score in best.items():
+                scores[note] += score
+        return scores
+
+    def _expand(self, term: str) -> list[tuple[str, dict]]:
+        """(word, postings) of every indexed word starting with term."""
+        words = self._words
+        expanded = []
+        position = bisect_left(words, term)
+        while position < len(words) and words[position].startswith(term):
+            word = words[position]
+            expanded.append((word, self._postings[word]))
+            position += 1
+        return expanded
+
+    @staticmethod
+    def _notes_of(postings) -> set:
+        if len(postings) == 1:
+            return set(postings[0][1])
+        notes = set()
+        for _, word_postings in postings:
+            notes.update(word_postings)
+        return notes
+
+    @staticmethod
+    def _idf(document_frequency: int, note_count: int) -> float:
+        return math.log(1 + (note_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _drop(self, note) -> None:
+        counts = self._counts.pop(note)
+        self._total_length -= self._lengths.pop(note)
+        for word in counts:
+            postings = self._postings[word]
+            del postings[note]
+            if not postings:
+                del self._postings[word]
+                del self._words[bisect_left(self._words, word)]
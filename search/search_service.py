@@ -1,22 +1,31 @@
 # search/search_service.py
 import difflib
 
+FUZZY_THRESHOLD = 0.3
+
+
 class SearchService:
 
-    def exact_search(self, contacts, query):
+    def exact_search(self, contacts, query, index=None):
         query = query.lower()
+
+        if index is not None:
+            return [contacts[key] for key in index.search(query)]
+
         results = []
 
         for record in contacts.values():
-            fields = self.collect_fields(record)
-            combined = " ".join(fields)
-            if query in combined:
+            if query in self.search_text(record):
                 results.append(record)
 
         return results
 
-    def fuzzy_search(self, contacts, query, limit=5):
+    def fuzzy_search(self, contacts, query, limit=5, index=None):
         query = query.lower()
+
+        if index is not None:
+            return [contacts[key] for key in index.search(query, limit, FUZZY_THRESHOLD)]
+
         scored = []
 
         for record in contacts.values():
@@ -31,9 +40,17 @@ class SearchService:
             scored.append((best_score, record))
 
         scored.sort(key=lambda x: x[0], reverse=True)
-        return [record for score, record in scored if score >= 0.3][:limit]
+        return [record for score, record in scored if score >= FUZZY_THRESHOLD][:limit]
+
+    def search_text(self, record):
+        return " ".join(self.collect_fields(record))
 
     def collect_fields(self, record):
+        # Records keep their normalized fields cached between queries
+        search_keys = getattr(record, "search_keys", None)
+        if search_keys is not None:
+            return search_keys
+
         fields = []
 
         if getattr(record, "name", None):
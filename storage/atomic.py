@@ -0,0 +1,82 @@
+"""Crash-safe file replacement: write to a temp file, fsync, then rename over the target."""
+
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+from storage.compressors import open_compressed
+
+DEFAULT_BACKUPS = 1
+
+
+def backup_paths(path: Path, count: int) -> list[Path]:
+    """Backup files of path, newest first."""
+    return [path.with_name(f"{path.name}.bak{i}") for i in range(1, count + 1)]
+
+
+def rotate_backups(path: Path, count: int) -> None:
+    """Shift path.bak1..bakN-1 down one slot and make .bak1 a copy of path.
+
+    path itself stays in place, so a crash before the new version is
+    renamed over it never leaves the book without its main file.
+    """
+    if count <= 0 or not path.exists():
+        return
+    backups = backup_paths(path, count)
+    for older, newer in zip(reversed(backups), reversed(backups[:-1])):
+        if newer.exists():
+            os.replace(newer, older)
+    staged = backups[0].with_name(f"{backups[0].name}.tmp")
+    if staged.exists():
+        staged.unlink()
+    try:
+        # A hard link shares the data: renaming the new file over path later
+        # leaves the old contents behind as .bak1 without copying them
+        os.link(path, staged)
+    except OSError:
+        shutil.copy2(path, staged)
+    os.replace(staged, backups[0])
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "wb", encoding: str = None, backups: int = 0,
+                 compression: str = None):
+    """Open a temp file next to path; on success it atomically becomes path.
+
+    If the block raises, the temp file is removed and path is left untouched.
+    With compression set, the block writes through that codec.
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        if compression is None:
+            with open(tmp_path, mode, encoding=encoding) as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with open(tmp_path, "wb") as raw:
+                # Closing the codec writes its trailer; only then is the file complete
+                with open_compressed(raw, mode, compression, encoding) as f:
+                    yield f
+                raw.flush()
+                os.fsync(raw.fileno())
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+    rotate_backups(path, backups)
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Makes the rename itself durable; directories can't be opened on Windows
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,78 @@
+"""Background saving of the repository shortly after it changes."""
+
+import threading
+import time
+
+AUTOSAVE_DELAY = 2.0
+AUTOSAVE_MAX_DELAY = 30.0
+
+
+class AutoSaver:
+    """Saves a dirty repository from a background thread.
+
+    A save starts once no change arrived for ``delay`` seconds, but no later
+    than ``max_delay`` seconds after the first unsaved change. Code that
+    mutates the repository holds ``lock`` meanwhile, so a save never sees a
+    half-applied command.
+    """
+
+    def __init__(self, storage, repository, delay: float = AUTOSAVE_DELAY,
+                 max_delay: float = AUTOSAVE_MAX_DELAY):
+        self.storage = storage
+        self.repository = repository
+        self.delay = delay
+        self.max_delay = max_delay
+        self.lock = threading.RLock()
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._last_change = 0.0
+        self._thread = None
+
+    def start(self) -> None:
+        self.repository.subscribe(self._on_change)
+        self._thread = threading.Thread(target=self._run, name="autosaver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> bool:
+        """Stop the background thread and save whatever is still unsaved."""
+        self.repository.unsubscribe(self._on_change)
+        if self._thread is not None:
+            self._stopped.set()
+            self._changed.set()
+            self._thread.join()
+            self._thread = None
+        return self.flush()
+
+    def flush(self) -> bool:
+        """Save right away if the repository has unsaved changes."""
+        with self.lock:
+            if not self.repository.dirty:
+                return True
+            changed, deleted, notes_changed = self.repository.pending_changes()
+            saved = self.storage.save_changes(self.repository, changed, deleted, notes_changed)
+            if saved:
+                self.repository.mark_clean()
+            return saved
+
+    def _on_change(self, event: str, payload) -> None:
+        self._last_change = time.monotonic()
+        self._changed.set()
+
+    def _run(self) -> None:
+        while True:
+            self._changed.wait()
+            if self._stopped.is_set():
+                return
+
+            deadline = time.monotonic() + self.max_delay
+            while True:
+                wake_at = min(self._last_change + self.delay, deadline)
+                remaining = wake_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self._stopped.wait(remaining):
+                    return
+
+            # Cleared before saving: a change made during the save schedules another one
+            self._changed.clear()
+            self.flush()
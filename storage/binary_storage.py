@@ -0,0 +1,380 @@
+"""Compact binary format, read in place through mmap.
+
+Layout, all integers little-endian:
+
+    MAGIC
+    string table     u32 length + UTF-8 bytes for every distinct value
+    string offsets   u64 per string id
+    records          u32 length + u32 fields per contact: name, address,
+                     birthday ordinal, phone count, email count, phone ids, email ids
+    record offsets   u64 per contact, in book order
+    name order       u32 contact numbers sorted by the name's UTF-8 bytes
+    notes            pickled list of notes
+    footer           section offsets and counts
+
+Each value is stored once however many contacts share it. Opening the file
+decodes nothing: a name lookup is a binary search over the name order and
+only the record found is turned into a ``Record``.
+"""
+
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime
+
+from repositories.contact_repository import ContactRepository
+from storage.atomic import DEFAULT_BACKUPS, atomic_write
+from storage.record_codec import build_record, record_to_row
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+MAGIC = b"ABBIN001"
+NO_VALUE = 0xFFFFFFFF
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+# string offsets, string count, record offsets, record count, name order, notes
+_FOOTER = struct.Struct("<6Q")
+
+
+def write_book(f, rows, notes) -> None:
+    """Write contacts given as record rows (see record_to_row) plus notes to f."""
+    strings = {}
+    records = []
+    names = []
+    for name, phones, emails, address, birthday in rows:
+        fields = [
+            strings.setdefault(name, len(strings)),
+            strings.setdefault(address, len(strings)) if address else NO_VALUE,
+            birthday.toordinal() if birthday else 0,
+            len(phones),
+            len(emails),
+        ]
+        fields.extend(strings.setdefault(phone, len(strings)) for phone in phones)
+        fields.extend(strings.setdefault(email, len(strings)) for email in emails)
+        records.append(fields)
+        names.append(name.encode("utf-8"))
+
+    f.write(MAGIC)
+    position = len(MAGIC)
+    string_offsets = []
+    for value in strings:
+        data = value.encode("utf-8")
+        string_offsets.append(position)
+        f.write(_U32.pack(len(data)))
+        f.write(data)
+        position += _U32.size + len(data)
+
+    strings_at = position
+    f.write(struct.pack(f"<{len(string_offsets)}Q", *string_offsets))
+    position += _U64.size * len(string_offsets)
+
+    record_offsets = []
+    for fields in records:
+        record_offsets.append(position)
+        f.write(_U32.pack(_U32.size * len(fields)))
+        f.write(struct.pack(f"<{len(fields)}I", *fields))
+        position += _U32.size * (len(fields) + 1)
+
+    records_at = position
+    f.write(struct.pack(f"<{len(record_offsets)}Q", *record_offsets))
+    position += _U64.size * len(record_offsets)
+
+    order_at = position
+    order = sorted(range(len(names)), key=names.__getitem__)
+    f.write(struct.pack(f"<{len(order)}I", *order))
+    position += _U32.size * len(order)
+
+    notes_data = pickle.dumps(notes)
+    f.write(notes_data)
+    f.write(_FOOTER.pack(
+        strings_at, len(string_offsets), records_at, len(record_offsets), order_at, position
+    ))
+
+
+class BinaryBook:
+    """Read-only view of a binary book file mapped into memory."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary address book")
+
+        self._footer_at = len(self._map) - _FOOTER.size
+        (self._strings_at, string_count, self._records_at, self.count,
+         self._order_at, self._notes_at) = _FOOTER.unpack_from(self._map, self._footer_at)
+        self._records_start = self._strings_at + _U64.size * string_count
+        # Every string decoded at once, only for passes over the whole book
+        self._strings = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._map.close()
+            self._file.close()
+            self._file = None
+        self._strings = None
+
+    def notes(self) -> list:
+        return pickle.loads(self._map[self._notes_at:self._footer_at])
+
+    def find(self, name: str):
+        """Position of the contact called name, or None."""
+        key = name.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            position = _U32.unpack_from(self._map, self._order_at + _U32.size * middle)[0]
+            current = self._string_bytes(self._fields(position)[0])
+            if current == key:
+                return position
+            if current < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def row(self, position: int) -> tuple:
+        """The contact at position as a record row, without building a Record."""
+        fields = self._fields(position)
+        name_id, address_id, ordinal, phone_count, email_count = fields[:5]
+        ids = fields[5:]
+        return (
+            self._string(name_id),
+            [self._string(i) for i in ids[:phone_count]],
+            [self._string(i) for i in ids[phone_count:phone_count + email_count]],
+            self._string(address_id) if address_id != NO_VALUE else None,
+            datetime.fromordinal(ordinal) if ordinal else None,
+        )
+
+    def record(self, position: int):
+        return build_record(*self.row(position))
+
+    def rows(self):
+        """Every contact as a record row, in book order.
+
+        Reads each section in one go instead of field by field, which is
+        what makes full passes (loading everything, building the search
+        indexes, saving) cheap.
+        """
+        strings = self._all_strings()
+        values = self._u32_array(self._records_start, self._records_at)
+        i = 0
+        for _ in range(self.count):
+            end = i + 1 + values[i] // _U32.size
+            name_id, address_id, ordinal, phone_count, email_count = values[i + 1:i + 6]
+            phones_end = i + 6 + phone_count
+            yield (
+                strings[name_id],
+                [strings[j] for j in values[i + 6:phones_end]],
+                [strings[j] for j in values[phones_end:phones_end + email_count]],
+                strings[address_id] if address_id != NO_VALUE else None,
+                datetime.fromordinal(ordinal) if ordinal else None,
+            )
+            i = end
+
+    @staticmethod
+    def summary(row: tuple) -> tuple:
+        """(name, search keys, birth date) of a row, matching what Record.search_keys gives."""
+        name, phones, emails, address, birthday = row
+        keys = [name.lower()]
+        keys.extend(phone.lower() for phone in phones)
+        keys.extend(email.lower() for email in emails)
+        if address:
+            keys.append(address.lower())
+        if birthday:
+            keys.append(birthday.strftime("%d.%m.%Y"))
+        return name, tuple(keys), birthday
+
+    def _fields(self, position: int) -> tuple:
+        offset = _U64.unpack_from(self._map, self._records_at + _U64.size * position)[0]
+        length = _U32.unpack_from(self._map, offset)[0]
+        return struct.unpack_from(f"<{length // _U32.size}I", self._map, offset + _U32.size)
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        offset = _U64.unpack_from(self._map, self._strings_at + _U64.size * string_id)[0]
+        length = _U32.unpack_from(self._map, offset)[0]
+        return self._map[offset + _U32.size:offset + _U32.size + length]
+
+    def _string(self, string_id: int) -> str:
+        if self._strings is not None:
+            return self._strings[string_id]
+        return self._string_bytes(string_id).decode("utf-8")
+
+    def _all_strings(self) -> list:
+        if self._strings is None:
+            blob = self._map[len(MAGIC):self._strings_at]
+            strings = []
+            position = 0
+            while position < len(blob):
+                length = _U32.unpack_from(blob, position)[0]
+                position += _U32.size
+                strings.append(blob[position:position + length].decode("utf-8"))
+                position += length
+            self._strings = strings
+        return self._strings
+
+    def _u32_array(self, start: int, end: int) -> array:
+        values = array("I")
+        values.frombytes(self._map[start:end])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+
+class BinaryContacts(MutableMapping):
+    """Name -> Record mapping backed by a BinaryBook.
+
+    Records are decoded on first lookup and kept; additions and deletions
+    are held in memory until the next save writes a new book.
+    """
+
+    def __init__(self, book: BinaryBook):
+        self._book = book
+        self._records = {}
+        # Names stored since the book was written, in insertion order
+        self._added = {}
+        self._deleted = set()
+
+    def __getitem__(self, name):
+        record = self._records.get(name)
+        if record is not None:
+            return record
+        if name in self._deleted:
+            raise KeyError(name)
+        position = self._book.find(name)
+        if position is None:
+            raise KeyError(name)
+        record = self._records[name] = self._book.record(position)
+        return record
+
+    def __setitem__(self, name, record):
+        if name not in self:
+            if name in self._deleted:
+                self._deleted.discard(name)
+            else:
+                self._added[name] = None
+        self._records[name] = record
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._records.pop(name, None)
+        if name in self._added:
+            del self._added[name]
+        else:
+            self._deleted.add(name)
+
+    def __contains__(self, name):
+        if name in self._records or name in self._added:
+            return True
+        if name in self._deleted:
+            return False
+        return self._book.find(name) is not None
+
+    def __iter__(self):
+        for row in self._book.rows():
+            if row[0] not in self._deleted:
+                yield row[0]
+        yield from list(self._added)
+
+    def __len__(self):
+        return self._book.count - len(self._deleted) + len(self._added)
+
+    def __reduce__(self):
+        # Pickling for other backends needs the real records
+        return (dict, (list(self.items()),))
+
+    def summaries(self):
+        """(name, search keys, birth date) of every contact without decoding records."""
+        for row in self._book.rows():
+            name = row[0]
+            if name in self._deleted:
+                continue
+            record = self._records.get(name)
+            if record is None:
+                yield self._book.summary(row)
+            else:
+                yield name, record.search_keys, record.birthday.value if record.birthday else None
+        for name in list(self._added):
+            record = self._records[name]
+            yield name, record.search_keys, record.birthday.value if record.birthday else None
+
+    def records(self):
+        """Every record in book order, without keeping the ones decoded here."""
+        for row in self._book.rows():
+            name = row[0]
+            if name in self._deleted:
+                continue
+            record = self._records.get(name)
+            yield build_record(*row) if record is None else record
+        for name in list(self._added):
+            yield self._records[name]
+
+    def rows(self):
+        """Every contact as a record row; untouched ones are copied straight from the book."""
+        for row in self._book.rows():
+            name = row[0]
+            if name in self._deleted:
+                continue
+            record = self._records.get(name)
+            yield row if record is None else record_to_row(record)
+        for name in list(self._added):
+            yield record_to_row(self._records[name])
+
+    def rebase(self, book: BinaryBook) -> None:
+        """Switch to a freshly written book that already holds every change."""
+        self._book.close()
+        self._book = book
+        self._added.clear()
+        self._deleted.clear()
+
+
+class BinaryStorage(StorageInterface):
+    supports_lazy = True
+
+    def __init__(self, file_path, lazy: bool = False, backups: int = DEFAULT_BACKUPS):
+        super().__init__(file_path, backups)
+        self.lazy = lazy
+        self._book = None
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        contacts = data.contacts
+        mapped = isinstance(contacts, BinaryContacts)
+        rows = contacts.rows() if mapped else (record_to_row(contacts[name]) for name in contacts)
+
+        with atomic_write(self.file_path, "wb", backups=self.backups) as f:
+            write_book(f, rows, data.notes)
+            # Windows refuses to replace a file that is still mapped
+            self.close()
+
+        if mapped:
+            self._book = BinaryBook(self.file_path)
+            contacts.rebase(self._book)
+        return True
+
+    @handle_load_errors
+    def load(self):
+        book = BinaryBook(self.file_path)
+        contacts = BinaryContacts(book)
+        notes = book.notes()
+        if self.lazy:
+            self._book = book
+        else:
+            contacts = {row[0]: build_record(*row) for row in book.rows()}
+            book.close()
+        return ContactRepository.from_storage(contacts, notes)
+
+    def close(self) -> None:
+        if self._book is not None:
+            self._book.close()
+            self._book = None
@@ -0,0 +1,41 @@
+"""Streaming compression codecs for the storage files.
+
+Codecs are picked by file suffix (``json.gz``, ``pkl.xz``...). gzip, bz2
+and lzma come with Python; zstd is used when available, from the standard
+library on Python 3.14+ or from the ``zstandard`` package.
+"""
+
+import bz2
+import gzip
+import lzma
+from functools import partial
+
+
+def _zstd_opener():
+    try:
+        from compression import zstd
+        return zstd.open
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard.open
+    except ImportError:
+        return None
+
+
+CODECS = {
+    # Level 9 is gzip's default but costs a lot of time for a few percent
+    "gz": partial(gzip.open, compresslevel=6),
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+if _zstd_opener() is not None:
+    CODECS["zst"] = _zstd_opener()
+
+
+def open_compressed(file, mode: str, codec: str, encoding: str = None):
+    """Open a path or binary file object through codec, in text mode unless mode has "b"."""
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    return CODECS[codec](file, mode, encoding=encoding)
@@ -1,28 +1,55 @@
 from pathlib import Path
 
+from storage.binary_storage import BinaryStorage
+from storage.compressors import CODECS
+from storage.journal_storage import JournalStorage
 from storage.json_storage import JSONStorage
+from storage.jsonl_storage import JSONLinesStorage
 from storage.pickle_storage import PickleStorage
+from storage.sharded_storage import ShardedStorage
+from storage.sqlite_storage import SQLiteStorage
 from storage.storage_interface import StorageInterface
 
 STORAGE_TYPES = {
     "pkl": PickleStorage,
     "json": JSONStorage,
+    "jsonl": JSONLinesStorage,
+    "log": JournalStorage,
+    "sqlite": SQLiteStorage,
+    "shards": ShardedStorage,
+    "bin": BinaryStorage,
 }
 
 
 class StorageFactory:
     @staticmethod
     def create_storage(
-        storage_type: str, base_path: None | Path = None
+        storage_type: str, base_path: None | Path = None, lazy: bool = False, **options
     ) -> StorageInterface:
         storage_type = storage_type.lower()
+        # "json.gz" is the json backend writing through the gz codec
+        base_type, _, codec = storage_type.partition(".")
 
-        if storage_type not in STORAGE_TYPES:
+        if base_type not in STORAGE_TYPES:
             raise ValueError(
                 f"Unsupported storage type: {storage_type}. "
                 f"Supported types: {', '.join(STORAGE_TYPES.keys())}"
             )
 
+        storage_class = STORAGE_TYPES[base_type]
+        if lazy and not storage_class.supports_lazy:
+            raise ValueError(f"Storage type {storage_type} does not support lazy loading")
+
+        if codec:
+            if codec not in CODECS:
+                raise ValueError(
+                    f"Unsupported compression: {codec}. "
+                    f"Supported codecs: {', '.join(CODECS.keys())}"
+                )
+            if not storage_class.supports_compression:
+                raise ValueError(f"Storage type {base_type} does not support compression")
+            options["compression"] = codec
+
         if base_path is None:
             base_path = Path(__file__).resolve().parent.parent / "files"
         
@@ -31,8 +58,20 @@ class StorageFactory:
 
         file_path = base_path / f"addressbook.{storage_type}"
 
-        return STORAGE_TYPES[storage_type](file_path)
+        if lazy and not storage_class.always_lazy:
+            options["lazy"] = True
+
+        try:
+            return storage_class(file_path, **options)
+        except TypeError:
+            raise ValueError(
+                f"Storage type {storage_type} does not accept options: {', '.join(options)}"
+            )
 
     @staticmethod
     def get_supported_types() -> list[str]:
         return list(STORAGE_TYPES.keys())
+
+    @staticmethod
+    def get_compression_codecs() -> list[str]:
+        return list(CODECS.keys())
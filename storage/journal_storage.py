@@ -0,0 +1,218 @@
+"""Append-only journal backend: one JSON line per changed record plus a pickled snapshot.
+
+Files next to ``addressbook.log``:
+
+* ``addressbook.log``           - active journal, appended on every save
+* ``addressbook.log.1``         - frozen journal being folded into the snapshot
+* ``addressbook.log.snapshot``  - pickled ``{"seq": n, "repository": ...}``
+
+Every journal entry carries a sequence number; entries already covered by
+the snapshot are skipped on replay, so a crash at any point of compaction
+never applies an entry twice. A save appends only the contacts that
+changed or were deleted since the previous one, and likewise only the
+changed and deleted notes (by note ID), so its cost follows the size of
+the edit, not of the book.
+"""
+
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+
+from repositories.contact_repository import ContactRepository
+from storage.atomic import atomic_write
+from storage.record_codec import note_from_dict, note_to_dict, record_from_dict, record_to_dict
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+COMPACT_THRESHOLD = 1000
+
+
+class JournalStorage(StorageInterface):
+    def __init__(self, file_path: Path, compact_threshold: int = COMPACT_THRESHOLD):
+        # Old snapshots are useless without the journal segments folded into
+        # them, so the journal relies on atomic snapshot writes, not backups
+        super().__init__(file_path, backups=0)
+        self.compact_threshold = compact_threshold
+        self.snapshot_path = file_path.with_name(file_path.name + ".snapshot")
+        self.frozen_path = file_path.with_name(file_path.name + ".1")
+        self._seq = 0
+        self._pending = 0
+        self._log = None
+        self._repository = None
+        self._compactor = None
+        self._lock = threading.Lock()
+
+    @handle_load_errors
+    def load(self):
+        if not (self.snapshot_path.exists() or self.file_path.exists() or self.frozen_path.exists()):
+            raise FileNotFoundError(self.file_path)
+
+        repository, self._seq = self._read_snapshot()
+        for path in (self.frozen_path, self.file_path):
+            self._seq, end = self._replay(repository, path, self._seq)
+            self._truncate(path, end)
+        self._pending = self._count_entries()
+        # Replaying went through the public API; none of it is unsaved
+        repository.mark_clean()
+        return repository
+
+    def attach(self, repository) -> None:
+        self._repository = repository
+        self._log = open(self.file_path, "a", encoding="utf-8")
+
+    @handle_save_errors
+    def save_changes(self, data: object, changed: dict, deleted: set, notes_changed: bool) -> bool:
+        if data is not self._repository or self._log is None:
+            return self.save(data)
+
+        entries = [{"op": "put_contact", "data": record_to_dict(record)} for record in changed.values()]
+        entries.extend({"op": "delete_contact", "name": name} for name in deleted)
+        if notes_changed:
+            changed_notes, deleted_notes = data.pending_note_changes()
+            entries.extend({"op": "put_note", "data": note_to_dict(note)} for note in changed_notes.values())
+            entries.extend({"op": "delete_note", "id": note_id} for note_id in deleted_notes)
+
+        with self._lock:
+            for entry in entries:
+                self._seq += 1
+                entry["seq"] = self._seq
+                self._log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._pending += len(entries)
+
+        if self._pending >= self.compact_threshold:
+            self._start_compaction()
+        return True
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        """Replace everything with a fresh snapshot of data."""
+        if self._compactor is not None:
+            self._compactor.join()
+
+        with self._lock:
+            self._write_snapshot(data, self._seq)
+            # The journal is folded into the snapshot; start an empty one
+            if self._log is not None:
+                self._log.close()
+            for path in (self.frozen_path, self.file_path):
+                if path.exists():
+                    path.unlink()
+            if self._log is not None:
+                self._log = open(self.file_path, "a", encoding="utf-8")
+            self._pending = 0
+        return True
+
+    def close(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    # --- Replay ---
+    def _read_snapshot(self):
+        if not self.snapshot_path.exists():
+            return ContactRepository(), 0
+        with open(self.snapshot_path, "rb") as f:
+            snapshot = pickle.load(f)
+        return snapshot["repository"], snapshot["seq"]
+
+    def _replay(self, repository, path: Path, after_seq: int) -> tuple[int, int]:
+        """Apply journal entries newer than after_seq.
+
+        Returns the last applied seq and the byte offset where the last
+        complete entry of the file ends.
+        """
+        if not path.exists():
+            return after_seq, 0
+
+        last_seq = after_seq
+        end = 0
+        with open(path, "rb") as f:
+            for line in f:
+                # A torn final line from a crash mid-append: nothing after it.
+                # Entries are written with their newline in one go, so a line
+                # without one is torn even if it happens to parse.
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                end += len(line)
+                if entry["seq"] <= last_seq:
+                    continue
+                self._apply(repository, entry)
+                last_seq = entry["seq"]
+        return last_seq, end
+
+    @staticmethod
+    def _truncate(path: Path, end: int) -> None:
+        """Cut a torn tail off path, so entries appended later are not glued onto it."""
+        if path.exists() and path.stat().st_size > end:
+            with open(path, "r+b") as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _apply(repository, entry: dict) -> None:
+        op = entry["op"]
+        if op == "put_contact":
+            repository.add_contact(record_from_dict(entry["data"], trusted=True))
+        elif op == "delete_contact":
+            repository.delete_contact(entry["name"])
+        elif op == "put_note":
+            data = entry["data"]
+            note = repository.get_note(data["id"])
+            if note is None:
+                repository.add_note(note_from_dict(data, trusted=True))
+            else:
+                repository.edit_note(note, data["text"], data["tags"])
+        elif op == "delete_note":
+            note = repository.get_note(entry["id"])
+            if note is not None:
+                repository.del_note(note)
+
+    def _count_entries(self) -> int:
+        count = 0
+        for path in (self.frozen_path, self.file_path):
+            if path.exists():
+                with open(path, "rb") as f:
+                    count += sum(1 for _ in f)
+        return count
+
+    # --- Compaction ---
+    def _start_compaction(self) -> None:
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+
+        with self._lock:
+            # If a previous compaction was interrupted its frozen segment is
+            # still there: fold that one first and keep appending to the log
+            if not self.frozen_path.exists():
+                self._log.close()
+                os.replace(self.file_path, self.frozen_path)
+                self._log = open(self.file_path, "a", encoding="utf-8")
+            self._pending = 0
+
+        self._compactor = threading.Thread(target=self._compact, name="journal-compactor")
+        self._compactor.start()
+
+    def _compact(self) -> None:
+        """Fold the frozen segment into a new snapshot without touching the live repository."""
+        try:
+            repository, seq = self._read_snapshot()
+            seq, _ = self._replay(repository, self.frozen_path, seq)
+            self._write_snapshot(repository, seq)
+            self.frozen_path.unlink()
+        except Exception as e:
+            print(f"Journal compaction failed, will retry later: {e}")
+
+    def _write_snapshot(self, repository, seq: int) -> None:
+        with atomic_write(self.snapshot_path, "wb") as f:
+            pickle.dump({"seq": seq, "repository": repository}, f)
@@ -1,5 +1,10 @@
 import json
+from collections.abc import Mapping
 from datetime import datetime
+
+from repositories.contact_repository import ContactRepository
+from storage.atomic import DEFAULT_BACKUPS, atomic_write
+from storage.record_codec import build_record, note_from_dict
 from storage.storage_interface import StorageInterface
 from storage.storage_error_decorators import handle_save_errors, handle_load_errors
 
@@ -12,38 +17,76 @@ class DateTimeEncoder(json.JSONEncoder):
 
 
 class JSONStorage(StorageInterface):
+    supports_compression = True
+
+    def __init__(self, file_path, indent: int | None = 2, backups: int = DEFAULT_BACKUPS,
+                 compression: str = None):
+        super().__init__(file_path, backups, compression)
+        # indent=None writes compact JSON, noticeably smaller and faster to save
+        self.indent = indent
+
     @handle_save_errors
     def save(self, data: object) -> bool:
         data_dict = self._serialize(data)
 
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data_dict, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+        with atomic_write(self.file_path, "w", encoding="utf-8", backups=self.backups,
+                          compression=self.compression) as f:
+            json.dump(data_dict, f, indent=self.indent, ensure_ascii=False, cls=DateTimeEncoder)
         return True
 
     @handle_load_errors
     def load(self):
-        with open(self.file_path, "r", encoding="utf-8") as f:
+        with self.open_file("r", encoding="utf-8") as f:
             data = json.load(f)
             return self._deserialize(data)
 
     def _serialize(self, obj) -> dict:
-        if hasattr(obj, '__dict__'):
+        state = self._state(obj)
+        if state is not None:
             result = {}
-            for key, value in obj.__dict__.items():
+            for key, value in state.items():
                 if isinstance(value, list):
                     result[key] = [self._serialize(item) for item in value]
-                elif isinstance(value, dict):
+                elif isinstance(value, Mapping):
+                    # Lazily loaded contacts are mappings too, items() loads them
                     result[key] = {k: self._serialize(v) for k, v in value.items()}
-                elif hasattr(value, '__dict__'):
-                    result[key] = self._serialize(value)
                 else:
-                    result[key] = value
+                    result[key] = self._serialize(value)
             return result
         return obj
 
-    def _deserialize(self, data):
-        if isinstance(data, dict):
-            return {k: self._deserialize(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._deserialize(item) for item in data]
-        return data
+    @staticmethod
+    def _state(obj):
+        """Attributes of one of our objects, None for plain values.
+
+        Classes with their own __getstate__ (slotted models, or ones that
+        leave derived attributes out) decide what is saved.
+        """
+        if getattr(type(obj), "__getstate__", None) not in (None, getattr(object, "__getstate__", None)):
+            return obj.__getstate__()
+        return getattr(obj, "__dict__", None)
+
+    def _deserialize(self, data) -> ContactRepository:
+        """Rebuild the repository from the attribute dump written by _serialize.
+
+        The file is our own output, so values are not run through the
+        field validators again.
+        """
+        contacts = {
+            name: self._deserialize_record(state)
+            for name, state in data.get("contacts", {}).items()
+        }
+        notes = [note_from_dict(note, trusted=True) for note in data.get("notes", [])]
+        return ContactRepository.from_storage(contacts, notes)
+
+    @staticmethod
+    def _deserialize_record(state: dict):
+        address = state.get("address")
+        birthday = state.get("birthday")
+        return build_record(
+            state["name"]["_value"],
+            [phone["_value"] for phone in state.get("phones", [])],
+            [email["_value"] for email in state.get("emails", [])],
+            address["_value"] if address else None,
+            datetime.fromisoformat(birthday["_value"]) if birthday else None,
+        )
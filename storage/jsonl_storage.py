@@ -0,0 +1,59 @@
+import json
+
+from repositories.contact_repository import ContactRepository
+from storage.atomic import atomic_write
+from storage.record_codec import note_from_dict, note_to_dict, record_from_dict, record_to_dict
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+FORMAT_NAME = "addressbook-jsonl"
+FORMAT_VERSION = 1
+
+
+class JSONLinesStorage(StorageInterface):
+    """JSON Lines: a header line, then one line per contact and one per note.
+
+    Records are encoded and decoded one at a time, so neither save nor load
+    ever holds the whole book as a JSON tree.
+    """
+
+    supports_compression = True
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        with atomic_write(self.file_path, "w", encoding="utf-8", backups=self.backups,
+                          compression=self.compression) as f:
+            for entry in self._entries(data):
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+        return True
+
+    @handle_load_errors
+    def load(self):
+        contacts = {}
+        notes = []
+
+        with self.open_file("r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != FORMAT_NAME:
+                raise ValueError(f"not an {FORMAT_NAME} file")
+
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "contact" in entry:
+                    record = record_from_dict(entry["contact"], trusted=True)
+                    contacts[record.name.value] = record
+                elif "note" in entry:
+                    notes.append(note_from_dict(entry["note"], trusted=True))
+
+        return ContactRepository.from_storage(contacts, notes)
+
+    @staticmethod
+    def _entries(repository):
+        yield {"format": FORMAT_NAME, "version": FORMAT_VERSION}
+        for name in repository.contacts:
+            yield {"contact": record_to_dict(repository.contacts[name])}
+        for note in repository.notes:
+            yield {"note": note_to_dict(note)}
@@ -1,17 +1,105 @@
+import os
 import pickle
+import struct
 
+from repositories.contact_repository import ContactRepository
+from repositories.lazy_contacts import ContactStub, LazyContacts
+from storage.atomic import DEFAULT_BACKUPS, atomic_write
 from storage.storage_error_decorators import handle_load_errors, handle_save_errors
 from storage.storage_interface import StorageInterface
 
+# Paged layout: MAGIC, one pickle per record, header pickle, header offset
+PAGED_MAGIC = b"ABPAGED1"
+_TRAILER = struct.Struct("<Q")
+
 
 class PickleStorage(StorageInterface):
+    supports_lazy = True
+    supports_compression = True
+
+    def __init__(self, file_path, lazy: bool = False, backups: int = DEFAULT_BACKUPS,
+                 compression: str = None):
+        if lazy and compression:
+            raise ValueError("compressed files can't be read lazily")
+        super().__init__(file_path, backups, compression)
+        self.lazy = lazy
+        self._reader = None
+
     @handle_save_errors
     def save(self, data: object) -> bool:
-        with open(self.file_path, "wb") as f:
+        if self.lazy:
+            return self._save_paged(data)
+
+        with atomic_write(self.file_path, "wb", backups=self.backups, compression=self.compression) as f:
             pickle.dump(data, f)
         return True
 
     @handle_load_errors
     def load(self) -> object:
-        with open(self.file_path, "rb") as f:
-            return pickle.load(f)
+        with self.open_file("rb") as f:
+            if f.read(len(PAGED_MAGIC)) != PAGED_MAGIC:
+                f.seek(0)
+                return pickle.load(f)
+        return self._load_paged()
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _load_paged(self):
+        self._reader = open(self.file_path, "rb")
+        self._reader.seek(-_TRAILER.size, os.SEEK_END)
+        (header_offset,) = _TRAILER.unpack(self._reader.read(_TRAILER.size))
+        self._reader.seek(header_offset)
+        header = pickle.load(self._reader)
+
+        stubs = {
+            name: ContactStub(offset, length, search_keys, birth_date)
+            for name, offset, length, search_keys, birth_date in header["contacts"]
+        }
+        contacts = LazyContacts(stubs, self._read_record)
+        if not self.lazy:
+            contacts = dict(contacts.items())
+            self.close()
+        return ContactRepository.from_storage(contacts, header["notes"])
+
+    def _read_record(self, stub: ContactStub):
+        self._reader.seek(stub.offset)
+        return pickle.loads(self._reader.read(stub.length))
+
+    def _save_paged(self, repository) -> bool:
+        contacts = repository.contacts
+        lazy = isinstance(contacts, LazyContacts)
+        index = []
+        moved = []
+
+        with atomic_write(self.file_path, "wb", backups=self.backups) as f:
+            f.write(PAGED_MAGIC)
+            for name in contacts:
+                stub = contacts.stub(name) if lazy else None
+                if stub is not None:
+                    # Never loaded, so never changed: copy the bytes as they are
+                    self._reader.seek(stub.offset)
+                    payload = self._reader.read(stub.length)
+                    search_keys, birth_date = stub.search_keys, stub.birth_date
+                    moved.append((stub, f.tell()))
+                else:
+                    record = contacts[name]
+                    payload = pickle.dumps(record)
+                    search_keys = record.search_keys
+                    birth_date = record.birthday.value if record.birthday else None
+                index.append((name, f.tell(), len(payload), search_keys, birth_date))
+                f.write(payload)
+
+            header_offset = f.tell()
+            pickle.dump({"contacts": index, "notes": repository.notes}, f)
+            f.write(_TRAILER.pack(header_offset))
+            # Windows refuses to replace a file that is still open
+            self.close()
+
+        if lazy:
+            for stub, offset in moved:
+                stub.offset = offset
+            self._reader = open(self.file_path, "rb")
+        return True
@@ -0,0 +1,104 @@
+"""Plain-dict encoding of contacts and notes shared by the storage backends.
+
+Decoding comes in two flavours: the default one goes through the public
+``Record``/``Note`` API and re-validates every value, ``trusted=True``
+rebuilds the objects directly for data this application wrote itself.
+"""
+
+from datetime import datetime
+
+from models.address import Address
+from models.birthday import Birthday
+from models.contact import Record
+from models.email import Email
+from models.name import Name
+from models.note import Note
+from models.phone import Phone
+
+
+def record_to_dict(record: Record) -> dict:
+    return {
+        "name": record.name.value,
+        "phones": [p.value for p in record.phones],
+        "emails": [e.value for e in record.emails],
+        "address": record.address.value if record.address else None,
+        "birthday": str(record.birthday) if record.birthday else None,
+    }
+
+
+def record_from_dict(data: dict, trusted: bool = False) -> Record:
+    if trusted:
+        birthday = data.get("birthday")
+        return build_record(
+            data["name"],
+            data.get("phones", ()),
+            data.get("emails", ()),
+            data.get("address"),
+            parse_birthday(birthday) if birthday else None,
+        )
+
+    record = Record(data["name"])
+    for phone in data.get("phones", []):
+        record.add_phone(phone)
+    for email in data.get("emails", []):
+        record.add_email(email)
+    if data.get("address"):
+        record.set_address(data["address"])
+    if data.get("birthday"):
+        record.set_birthday(data["birthday"])
+    return record
+
+
+def record_to_row(record: Record) -> tuple:
+    """The record's values as a flat tuple, much cheaper to pickle than the Record itself."""
+    return (
+        record.name.value,
+        [p.value for p in record.phones],
+        [e.value for e in record.emails],
+        record.address.value if record.address else None,
+        record.birthday.value if record.birthday else None,
+    )
+
+
+def record_from_row(row: tuple) -> Record:
+    return build_record(*row)
+
+
+def note_to_dict(note: Note) -> dict:
+    return note.to_dict()
+
+
+def note_from_dict(data: dict, trusted: bool = False) -> Note:
+    if trusted:
+        note = Note.__new__(Note)
+        note.text = data["text"]
+        note.tags = list(data.get("tags") or ())
+        note.id = data.get("id")
+        return note
+    note = Note(data["text"], data.get("tags"))
+    # The repository replaces missing or clashing IDs when the note is stored
+    note.id = data.get("id")
+    return note
+
+
+def parse_birthday(value: str) -> datetime:
+    """Fast parse of the DD.MM.YYYY format Birthday writes."""
+    return datetime(int(value[6:]), int(value[3:5]), int(value[:2]))
+
+
+def build_record(name, phones, emails, address=None, birthday=None) -> Record:
+    """Assemble a Record from already validated values, skipping the field setters."""
+    record = Record.__new__(Record)
+    record.name = _trusted_field(Name, name)
+    record.phones = [_trusted_field(Phone, phone) for phone in phones]
+    record.emails = [_trusted_field(Email, email) for email in emails]
+    record.address = _trusted_field(Address, address) if address else None
+    record.birthday = _trusted_field(Birthday, birthday) if birthday else None
+    record._search_keys = None
+    return record
+
+
+def _trusted_field(field_cls, value):
+    field = field_cls.__new__(field_cls)
+    field._value = value
+    return field
@@ -0,0 +1,228 @@
+"""Sharded backend: the book split over many small pickle files in one directory.
+
+Layout of ``addressbook.shards/``:
+
+* ``manifest.json``     - format marker and the number of shards
+* ``contacts-NN.pkl``   - ``{name: Record}`` for names whose crc32 falls into shard NN
+* ``notes-NN.pkl``      - a consecutive slice of the notes list
+
+With compression every shard file gets the codec suffix, e.g. ``contacts-NN.pkl.gz``.
+
+Shards are read and written independently and concurrently. A shard that
+can't be read (and has no readable backup) only loses its own contacts;
+it is moved aside to ``*.corrupt`` before being written again.
+
+Threads overlap the file I/O. With ``processes`` set, unpickling and
+pickling of full loads and saves run in a process pool instead; records
+cross the process boundary as plain rows (see ``record_to_row``), which
+pickle several times faster than the objects themselves. Incremental
+saves rewrite a few shards and always stay in threads: starting a pool
+would cost more than the pickling it saves.
+"""
+
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from repositories.contact_repository import ContactRepository
+from storage.atomic import DEFAULT_BACKUPS, atomic_write, backup_paths
+from storage.pickle_storage import PickleStorage
+from storage.record_codec import record_from_row, record_to_row
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+FORMAT_NAME = "addressbook-shards"
+FORMAT_VERSION = 1
+SHARD_COUNT = 16
+NOTE_SHARD_COUNT = 4
+
+
+def shard_of(name: str, count: int) -> int:
+    # crc32 rather than hash(): string hashes change between runs
+    return zlib.crc32(name.encode("utf-8")) % count
+
+
+def _decode_shard(path: Path, backups: int, compression: str):
+    """Process pool worker: load one shard, contacts come back as rows."""
+    part = PickleStorage(path, backups=backups, compression=compression).load()
+    if isinstance(part, dict):
+        return [record_to_row(record) for record in part.values()]
+    return part
+
+
+def _encode_shard(path: Path, payload, is_contacts: bool, backups: int, compression: str) -> bool:
+    """Process pool worker: rebuild one shard from rows and write it."""
+    if is_contacts:
+        payload = {row[0]: record_from_row(row) for row in payload}
+    return PickleStorage(path, backups=backups, compression=compression).save(payload)
+
+
+class ShardedStorage(StorageInterface):
+    supports_compression = True
+
+    def __init__(self, file_path: Path, shards: int = SHARD_COUNT, note_shards: int = NOTE_SHARD_COUNT,
+                 workers: int | None = None, processes: int = 0, backups: int = DEFAULT_BACKUPS,
+                 compression: str = None):
+        if shards < 1 or note_shards < 1:
+            raise ValueError("shard counts must be positive")
+        super().__init__(file_path, backups, compression)
+        self.shards = shards
+        self.note_shards = note_shards
+        self.workers = workers
+        # 0 keeps everything in this process
+        self.processes = processes
+        self.manifest_path = file_path / "manifest.json"
+        self._repository = None
+        # (shards, note_shards) of the files on disk, None until read or written
+        self._layout = None
+        self._shard_names = []
+        self._broken = set()
+
+    @handle_load_errors
+    def load(self):
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"not an {FORMAT_NAME} directory")
+
+        shards, note_shards = manifest["shards"], manifest["note_shards"]
+        paths = [self._contact_path(i) for i in range(shards)]
+        paths += [self._note_path(i) for i in range(note_shards)]
+        parts = self._read_shards(paths, shards)
+        for path, part in zip(paths, parts):
+            if part is None:
+                self._broken.add(path)
+                print(f"Shard {path.name} is unreadable, its data is missing from this session")
+
+        contacts = {}
+        self._shard_names = []
+        for part in parts[:shards]:
+            part = part or {}
+            contacts.update(part)
+            self._shard_names.append(set(part))
+        notes = [note for part in parts[shards:] for note in part or ()]
+
+        self._layout = (shards, note_shards)
+        return ContactRepository.from_storage(contacts, notes)
+
+    def attach(self, repository) -> None:
+        self._repository = repository
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        self.file_path.mkdir(parents=True, exist_ok=True)
+
+        buckets = [{} for _ in range(self.shards)]
+        for name in data.contacts:
+            buckets[shard_of(name, self.shards)][name] = data.contacts[name]
+        jobs = [(self._contact_path(i), bucket) for i, bucket in enumerate(buckets)]
+        jobs += self._note_jobs(data.notes)
+
+        if not self._write_shards(jobs):
+            return False
+        self._write_manifest()
+        self._remove_stale_shards()
+        self._shard_names = [set(bucket) for bucket in buckets]
+        self._layout = (self.shards, self.note_shards)
+        return True
+
+    @handle_save_errors
+    def save_changes(self, data: object, changed: dict, deleted: set, notes_changed: bool) -> bool:
+        if data is not self._repository or self._layout != (self.shards, self.note_shards):
+            return self.save(data)
+
+        touched = set()
+        for name in changed:
+            shard = shard_of(name, self.shards)
+            self._shard_names[shard].add(name)
+            touched.add(shard)
+        for name in deleted:
+            shard = shard_of(name, self.shards)
+            self._shard_names[shard].discard(name)
+            touched.add(shard)
+
+        jobs = [
+            (self._contact_path(i), {name: data.contacts[name] for name in self._shard_names[i]})
+            for i in sorted(touched)
+        ]
+        if notes_changed:
+            jobs += self._note_jobs(data.notes)
+        return self._write_shards(jobs, use_processes=False)
+
+    # --- Shard files ---
+    def _contact_path(self, index: int) -> Path:
+        return self.file_path / f"contacts-{index:02d}{self._suffix()}"
+
+    def _note_path(self, index: int) -> Path:
+        return self.file_path / f"notes-{index:02d}{self._suffix()}"
+
+    def _suffix(self) -> str:
+        return f".pkl.{self.compression}" if self.compression else ".pkl"
+
+    def _shard(self, path: Path) -> PickleStorage:
+        return PickleStorage(path, backups=self.backups, compression=self.compression)
+
+    def _note_jobs(self, notes):
+        size = -(-len(notes) // self.note_shards)
+        return [
+            (self._note_path(i), notes[i * size:(i + 1) * size])
+            for i in range(self.note_shards)
+        ]
+
+    def _read_shards(self, paths, contact_shards: int) -> list:
+        """Contents of every shard in paths, None for the unreadable ones."""
+        if not self.processes:
+            with ThreadPoolExecutor(self.workers) as pool:
+                return list(pool.map(lambda path: self._shard(path).load(), paths))
+
+        with ProcessPoolExecutor(self.processes) as pool:
+            parts = list(pool.map(_decode_shard, paths, repeat(self.backups), repeat(self.compression)))
+        for i, rows in enumerate(parts[:contact_shards]):
+            if rows is not None:
+                parts[i] = {row[0]: record_from_row(row) for row in rows}
+        return parts
+
+    def _write_shards(self, jobs, use_processes: bool = True) -> bool:
+        for path, _ in jobs:
+            if path in self._broken and path.exists():
+                # Keep whatever is left of it for manual recovery
+                os.replace(path, path.with_name(path.name + ".corrupt"))
+            self._broken.discard(path)
+
+        if not (self.processes and use_processes):
+            with ThreadPoolExecutor(self.workers) as pool:
+                return all(pool.map(lambda job: self._shard(job[0]).save(job[1]), jobs))
+
+        paths, payloads, kinds = [], [], []
+        for path, data in jobs:
+            is_contacts = isinstance(data, dict)
+            paths.append(path)
+            payloads.append([record_to_row(record) for record in data.values()] if is_contacts else data)
+            kinds.append(is_contacts)
+        with ProcessPoolExecutor(self.processes) as pool:
+            return all(pool.map(
+                _encode_shard, paths, payloads, kinds, repeat(self.backups), repeat(self.compression)
+            ))
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "shards": self.shards,
+            "note_shards": self.note_shards,
+        }
+        with atomic_write(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    def _remove_stale_shards(self) -> None:
+        # Left over from a layout with more shards than the current one
+        suffix = self._suffix()
+        for prefix, count in (("contacts", self.shards), ("notes", self.note_shards)):
+            for path in self.file_path.glob(f"{prefix}-*{suffix}"):
+                if int(path.name[len(prefix) + 1:-len(suffix)]) >= count:
+                    path.unlink()
+                    for backup in backup_paths(path, self.backups):
+                        backup.unlink(missing_ok=True)
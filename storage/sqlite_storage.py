@@ -0,0 +1,49 @@
+import copy
+import sqlite3
+
+from repositories.sqlite_contact_repository import SQLiteContactRepository
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+
+class SQLiteStorage(StorageInterface):
+    """Keeps the address book in SQLite; the repository it loads writes through to the database."""
+
+    # Records are always read from the database on demand
+    supports_lazy = True
+    always_lazy = True
+
+    def __init__(self, file_path):
+        # SQLite commits are already atomic, there is no file to rotate
+        super().__init__(file_path, backups=0)
+        self.connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.file_path, check_same_thread=False)
+        return self.connection
+
+    @handle_load_errors
+    def load(self):
+        # Only the schema is touched here; records are read when they are needed
+        return SQLiteContactRepository(self._connect())
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        if isinstance(data, SQLiteContactRepository) and data.connection is self.connection:
+            # Mutations are already written through, just make sure they are committed
+            data.connection.commit()
+            return True
+
+        # Any other repository replaces the database contents
+        connection = self._connect()
+        target = SQLiteContactRepository(connection)
+        with connection:
+            for table in ("note_tags", "notes", "emails", "phones", "contacts"):
+                connection.execute(f"DELETE FROM {table}")
+        for record in data.get_all_contacts():
+            target.add_contact(record)
+        for note in data.notes:
+            # Stored through a copy: the database would renumber a clashing ID
+            target.add_note(copy.copy(note))
+        return True
@@ -3,9 +3,9 @@ import json
 
 
 def handle_save_errors(func):
-    def wrapper(self, data):
+    def wrapper(self, data, *args):
         try:
-            return func(self, data)
+            return func(self, data, *args)
         except (IOError, OSError) as e:
             print(f"Can't save data to {self.file_path}: {e}")
             return False
@@ -20,18 +20,41 @@ def handle_save_errors(func):
 
 def handle_load_errors(func):
     def wrapper(self):
-        try:
-            return func(self)
-        except FileNotFoundError:
-            print(f"File {self.file_path} not found")
-            return None
-        except (pickle.UnpicklingError, EOFError, AttributeError) as e:
-            print(f"File {self.file_path} is corrupted (pickle): {e}")
-            return None
-        except json.JSONDecodeError as e:
-            print(f"File {self.file_path} is corrupted (json): {e}")
-            return None
-        except Exception as e:
-            print(f"Can't load data from {self.file_path}: {e}")
-            return None
+        data = _load_or_report(func, self)
+        if data is not None:
+            return data
+
+        # Fall back to the most recent backup that still loads
+        original_path = self.file_path
+        for backup_path in self.backup_paths():
+            self.file_path = backup_path
+            try:
+                data = _load_or_report(func, self)
+            finally:
+                self.file_path = original_path
+            if data is not None:
+                print(f"Recovered data from backup {backup_path}")
+                return data
+        return None
     return wrapper
+
+
+def _load_or_report(func, self):
+    try:
+        return func(self)
+    except FileNotFoundError:
+        print(f"File {self.file_path} not found")
+        return None
+    except EOFError as e:
+        # Cut-off pickles and compressed streams both end up here
+        print(f"File {self.file_path} is truncated: {e}")
+        return None
+    except (pickle.UnpicklingError, AttributeError) as e:
+        print(f"File {self.file_path} is corrupted (pickle): {e}")
+        return None
+    except json.JSONDecodeError as e:
+        print(f"File {self.file_path} is corrupted (json): {e}")
+        return None
+    except Exception as e:
+        print(f"Can't load data from {self.file_path}: {e}")
+        return None
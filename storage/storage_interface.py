@@ -1,10 +1,24 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from storage.atomic import DEFAULT_BACKUPS, backup_paths
+from storage.compressors import open_compressed
+
 
 class StorageInterface(ABC):
-    def __init__(self, file_path: Path):
+    # Whether the backend can hand out records on demand (lazy=True)
+    supports_lazy = False
+    # Whether records are read on demand anyway, so there is no lazy option to pass
+    always_lazy = False
+    # Whether the backend writes whole files that can go through a codec
+    supports_compression = False
+
+    def __init__(self, file_path: Path, backups: int = DEFAULT_BACKUPS, compression: str = None):
         self.file_path = file_path
+        # Previous versions kept as file.bak1..N on every save
+        self.backups = backups
+        # Codec name from storage.compressors.CODECS, None for plain files
+        self.compression = compression
 
     @abstractmethod
     def save(self, data: object) -> bool:
@@ -15,3 +29,28 @@ class StorageInterface(ABC):
     def load(self) -> object:
         """Load data from file."""
         pass
+
+    def save_changes(self, data: object, changed: dict, deleted: set, notes_changed: bool) -> bool:
+        """Persist only what changed since the last save.
+
+        changed maps contact names to records, deleted holds removed names.
+        Backends that can't update in place rewrite everything.
+        """
+        return self.save(data)
+
+    def open_file(self, mode: str = "rb", encoding: str = None):
+        """Open the storage file for reading, decompressing it on the fly if needed."""
+        if self.compression is None:
+            return open(self.file_path, mode, encoding=encoding)
+        return open_compressed(self.file_path, mode, self.compression, encoding)
+
+    def backup_paths(self) -> list[Path]:
+        """Existing backups of the storage file, newest first."""
+        return [path for path in backup_paths(self.file_path, self.backups) if path.exists()]
+
+    def attach(self, repository) -> None:
+        """Called once the repository for this session is ready.
+
+        Backends that persist individual mutations subscribe to it here.
+        """
+        pass
@@ -0,0 +1,120 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from models.contact import Record
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+from storage.binary_storage import BinaryBook, BinaryContacts
+from storage.factory import StorageFactory
+from storage.record_codec import record_to_row
+
+
+def make_record(name, phone=None, birthday=None):
+    record = Record(name)
+    if phone:
+        record.add_phone(phone)
+    record.add_email(f"{len(name)}@example.com")
+    record.set_address(f"{name} street 1")
+    if birthday:
+        record.set_birthday(birthday)
+    return record
+
+
+class BinaryStorageTest(unittest.TestCase):
+    NAMES = ["Zoë", "Олена", "Ärger", "Bob", "李雷", "Émile", "bob", "Ann"]
+
+    def setUp(self):
+        self.base_path = Path(tempfile.mkdtemp(prefix="addressbook-test-"))
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path)
+
+    def open_storage(self, lazy=True):
+        storage = StorageFactory.create_storage("bin", self.base_path, lazy=lazy)
+        self.addCleanup(storage.close)
+        return storage
+
+    def saved_book(self):
+        storage = self.open_storage(lazy=False)
+        repository = ContactRepository()
+        for i, name in enumerate(self.NAMES):
+            repository.add_contact(make_record(name, f"050000000{i}", f"0{i + 1}.02.199{i}"))
+        repository.notes = [Note("Grüße an alle", ["привіт"]), Note("plain")]
+        storage.save(repository)
+        return repository
+
+    @staticmethod
+    def rows(repository):
+        return [record_to_row(record) for record in repository.get_all_contacts()]
+
+    def test_round_trip_keeps_non_ascii_names_fields_and_notes(self):
+        expected = self.saved_book()
+        for lazy in (True, False):
+            repository = self.open_storage(lazy).load()
+            self.assertEqual(self.rows(repository), self.rows(expected))
+            self.assertEqual(
+                [(note.text, note.tags) for note in repository.notes],
+                [("Grüße an alle", ["привіт"]), ("plain", [])],
+            )
+
+    def test_find_hits_every_name_and_misses_the_rest(self):
+        self.saved_book()
+        book = BinaryBook(self.open_storage().file_path)
+        self.addCleanup(book.close)
+        for name in self.NAMES:
+            position = book.find(name)
+            self.assertIsNotNone(position, name)
+            self.assertEqual(book.row(position)[0], name)
+        # Neighbours in UTF-8 byte order and prefixes must not match
+        for name in ["", "A", "An", "Anna", "BOB", "Zoe", "Оле", "李", "￿"]:
+            self.assertIsNone(book.find(name), name)
+
+    def test_deleted_then_re_added_contact_is_saved_once_with_new_fields(self):
+        self.saved_book()
+        storage = self.open_storage()
+        repository = storage.load()
+        self.assertIsInstance(repository.contacts, BinaryContacts)
+
+        repository.delete_contact("Олена")
+        self.assertIsNone(repository.find_contact("Олена"))
+        self.assertNotIn("Олена", repository.contacts)
+        repository.add_contact(make_record("Олена", "0671234567"))
+        self.assertEqual(len(repository.contacts), len(self.NAMES))
+        self.assertEqual(list(repository.contacts).count("Олена"), 1)
+
+        expected = self.rows(repository)
+        storage.save(repository)
+        reloaded = self.open_storage().load()
+        self.assertEqual(self.rows(reloaded), expected)
+        self.assertEqual(reloaded.find_contact("Олена").phones[0].value, "0671234567")
+        self.assertIsNone(reloaded.find_contact("Олена").birthday)
+
+    def test_changes_after_a_save_rebase_onto_the_new_book(self):
+        self.saved_book()
+        storage = self.open_storage()
+        repository = storage.load()
+        repository.delete_contact("Bob")
+        repository.add_contact(make_record("Ōno", "0990000000"))
+        storage.save(repository)
+
+        # The mapping now reads the book it just wrote, with nothing pending
+        contacts = repository.contacts
+        self.assertEqual(contacts._added, {})
+        self.assertEqual(contacts._deleted, set())
+        self.assertNotIn("Bob", contacts)
+        self.assertIn("Ōno", contacts)
+        self.assertEqual(len(contacts), len(self.NAMES))
+
+        # And keeps tracking changes made on top of it
+        repository.delete_contact("Ōno")
+        repository.add_contact(make_record("Bob", "0500000099"))
+        expected = self.rows(repository)
+        storage.save(repository)
+        self.assertEqual(self.rows(self.open_storage().load()), expected)
+        self.assertEqual(self.rows(repository), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from handlers import birthday_service
+from handlers.birthday_service import WEEKEND_SHIFTS, next_birthdays
+from models.contact import Record
+from repositories.contact_repository import ContactRepository
+
+
+def brute_force_next_birthdays(birth_dates, start, window):
+    """{name: (offset, shift, age)} by walking every contact's calendar year by year."""
+    hits = {}
+    for name, born in birth_dates.items():
+        for year in (start.year, start.year + 1):
+            try:
+                birthday = born.replace(year=year)
+            except ValueError:
+                # Feb 29 birthdays are celebrated on Feb 28 in common years
+                birthday = born.replace(year=year, day=28)
+            if birthday >= start:
+                break
+        offset = (birthday - start).days
+        if offset <= window:
+            hits[name] = (offset, WEEKEND_SHIFTS.get(birthday.weekday(), 0), birthday.year - born.year)
+    return hits
+
+
+class BirthdayWindowTest(unittest.TestCase):
+    # Around Feb 29 in leap and common years and across New Year
+    STARTS = [
+        date(2023, 2, 27), date(2023, 2, 28), date(2023, 3, 1),
+        date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1),
+        date(2025, 2, 28), date(2027, 3, 1), date(2100, 2, 28),
+        date(2023, 12, 25), date(2023, 12, 31), date(2024, 12, 31), date(2025, 1, 1),
+    ]
+    WINDOWS = [0, 1, 2, 3, 7, 30, 364, 365, 400]
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(19)
+        cls.birth_dates = {}
+        special = [(2, 28), (2, 29), (3, 1), (12, 31), (1, 1)]
+        for i in range(600):
+            if i < 100:
+                month, day = special[i % len(special)]
+                year = rng.choice([1960, 1984, 1996, 2000]) if (month, day) == (2, 29) else rng.randint(1950, 2015)
+                born = date(year, month, day)
+            else:
+                born = date(1950, 1, 1) + timedelta(days=rng.randrange(65 * 365))
+            cls.birth_dates[f"c{i}"] = born
+
+    def make_repository(self, columnar):
+        repository = ContactRepository()
+        if columnar:
+            repository.use_columnar()
+        for name, born in self.birth_dates.items():
+            record = Record(name)
+            record.set_birthday(born.strftime("%d.%m.%Y"))
+            repository.add_contact(record)
+        # Contacts without a birthday must never show up
+        repository.add_contact(Record("nobody"))
+        return repository
+
+    def window(self, repository, start, days):
+        names, months, birth_days, years = repository.birthday_columns(start, days)
+        rows, offsets, shifts, ages = next_birthdays(months, birth_days, years, start, days)
+        return {names[row]: (offset, shift, age) for row, offset, shift, age in zip(rows, offsets, shifts, ages)}
+
+    def check_against_brute_force(self, columnar):
+        repository = self.make_repository(columnar)
+        for start in self.STARTS:
+            for days in self.WINDOWS:
+                with self.subTest(start=start, days=days):
+                    expected = brute_force_next_birthdays(self.birth_dates, start, days)
+                    self.assertEqual(self.window(repository, start, days), expected)
+
+    def test_calendar_index_matches_brute_force(self):
+        self.check_against_brute_force(columnar=False)
+
+    def test_columnar_store_matches_brute_force(self):
+        self.check_against_brute_force(columnar=True)
+
+    def test_plain_loop_matches_brute_force_without_numpy(self):
+        with mock.patch.object(birthday_service, "np", None):
+            self.check_against_brute_force(columnar=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import string
+import unittest
+
+from models.contact import Record
+from search.fuzzy_index import FuzzyIndex
+from search.search_service import SearchService
+
+
+class FuzzyIndexTest(unittest.TestCase):
+    def test_top_matches_equal_the_unindexed_search(self):
+        rng = random.Random(5)
+
+        def word(shortest, longest):
+            return "".join(rng.choice("abcdeilmnorst") for _ in range(rng.randint(shortest, longest)))
+
+        def digits(count):
+            return "".join(rng.choice(string.digits) for _ in range(count))
+
+        contacts = {}
+        for _ in range(500):
+            record = Record(f"{word(3, 8).capitalize()} {word(3, 9).capitalize()}")
+            if rng.random() < 0.8:
+                record.add_phone("0" + digits(9))
+            if rng.random() < 0.5:
+                record.add_email(f"{word(3, 8)}@{word(3, 6)}.com")
+            contacts[record.name.value] = record
+
+        service = SearchService()
+        index = FuzzyIndex()
+        for name, record in contacts.items():
+            index.add(name, service.collect_fields(record))
+
+        names = list(contacts)
+        for _ in range(100):
+            query = rng.choice([
+                word(2, 6), word(5, 12), rng.choice(names)[:rng.randint(2, 10)], digits(rng.randint(3, 10)),
+            ])
+            expected = [record.name.value for record in service.fuzzy_search(contacts, query)]
+            found = [record.name.value for record in service.fuzzy_search(contacts, query, index=index)]
+            self.assertEqual(found, expected, query)
+
+
+if __name__ == "__main__":
+    unittest.main()
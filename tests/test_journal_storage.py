@@ -0,0 +1,92 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from models.contact import Record
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+from storage.factory import StorageFactory
+
+
+class JournalStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.base_path = Path(tempfile.mkdtemp(prefix="addressbook-test-"))
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path)
+
+    def open_storage(self):
+        storage = StorageFactory.create_storage("log", self.base_path)
+        try:
+            repository = storage.load()
+        except FileNotFoundError:
+            repository = ContactRepository()
+        if not isinstance(repository, ContactRepository):
+            repository = ContactRepository()
+        storage.attach(repository)
+        return storage, repository
+
+    @staticmethod
+    def save_changes(storage, repository):
+        changed, deleted, notes_changed = repository.pending_changes()
+        storage.save_changes(repository, changed, deleted, notes_changed)
+        repository.mark_clean()
+
+    def test_entries_after_a_torn_line_survive_the_next_load(self):
+        storage, repository = self.open_storage()
+        storage.save(repository)
+        repository.add_contact(Record("A"))
+        repository.add_contact(Record("B"))
+        self.save_changes(storage, repository)
+        storage.close()
+
+        # A crash in the middle of appending the next entry
+        with open(storage.file_path, "ab") as f:
+            f.write(b'{"op": "put_contact", "da')
+
+        storage, repository = self.open_storage()
+        self.assertEqual(sorted(repository.contacts), ["A", "B"])
+        repository.add_contact(Record("C"))
+        self.save_changes(storage, repository)
+        storage.close()
+
+        storage, repository = self.open_storage()
+        storage.close()
+        self.assertEqual(sorted(repository.contacts), ["A", "B", "C"])
+        with open(storage.file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                json.loads(line)
+
+    def test_note_changes_are_journaled_by_note_id(self):
+        storage, repository = self.open_storage()
+        for i in range(5):
+            repository.add_note(Note(f"note {i}", ["old"]))
+        storage.save(repository)
+        repository.mark_clean()
+
+        notes = repository.notes
+        repository.edit_note(notes[1], "edited", ["new"])
+        repository.del_note(notes[3])
+        repository.add_note(Note("added"))
+        self.save_changes(storage, repository)
+        storage.close()
+
+        with open(storage.file_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(
+            sorted((entry["op"], entry.get("id") or entry["data"]["id"]) for entry in entries),
+            [("delete_note", 4), ("put_note", 2), ("put_note", 6)],
+        )
+
+        storage, loaded = self.open_storage()
+        storage.close()
+        self.assertEqual(
+            [(note.id, note.text, note.tags) for note in loaded.notes],
+            [(note.id, note.text, note.tags) for note in repository.notes],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from search.ngram_index import NgramIndex
+
+
+class NgramIndexTest(unittest.TestCase):
+    def test_matches_a_scan_through_adds_edits_and_removals(self):
+        rng = random.Random(1)
+        words = ["ann", "anna", "bob", "bobby", "carl", "main", "street", "mail", "com", "x@y.com"]
+        keys = [f"k{i}" for i in range(300)]
+        index = NgramIndex()
+        texts = {}
+        queries = ["ann", "bob", "mai", "a", "com", "street ann", "x@", "zzz"]
+
+        for step in range(5000):
+            key = rng.choice(keys)
+            if rng.random() < 0.3:
+                index.remove(key)
+                texts.pop(key, None)
+            else:
+                text = " ".join(rng.sample(words, 3))
+                index.add(key, text)
+                # Re-indexing keeps the key's place, like updating a dict entry
+                texts[key] = text
+            if step % 50 == 0:
+                for query in queries:
+                    expected = [key for key, text in texts.items() if query in text]
+                    self.assertEqual(index.search(query), expected, query)
+        self.assertEqual(len(index), len(texts))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import math
+import random
+import sqlite3
+import unittest
+
+from models.note import Note
+from repositories.sqlite_contact_repository import SQLiteContactRepository
+from search.note_index import BM25_B, BM25_K1, NoteIndex, parse_query, tokenize
+
+WORDS = ["milk", "milky", "mill", "bread", "brea", "eggs", "egg", "café", "cafe", "кава", "x1", "x10", "to_do"]
+
+
+def words_of(note):
+    words = tokenize(note.text)
+    for tag in note.tags:
+        words.extend(tokenize(tag))
+    return words
+
+
+def brute_force_scores(notes, query):
+    """{note: BM25 score} of the notes matching query, checking every word of every note."""
+    note_words = {note: words_of(note) for note in notes}
+    average_length = sum(map(len, note_words.values())) / len(notes)
+    scores = {}
+    for group in parse_query(query):
+        for note, words in note_words.items():
+            if not all(any(word.startswith(term) for word in words) for term in group):
+                continue
+            score = 0.0
+            for term in group:
+                best = 0.0
+                for word in set(words):
+                    if not word.startswith(term):
+                        continue
+                    containing = sum(word in other for other in note_words.values())
+                    idf = math.log(1 + (len(notes) - containing + 0.5) / (containing + 0.5))
+                    frequency = words.count(word)
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(words) / average_length)
+                    best = max(best, idf * frequency * (BM25_K1 + 1) / (frequency + norm))
+                score += best
+            scores[note] = max(score, scores.get(note, 0.0))
+    return scores
+
+
+class NoteIndexTest(unittest.TestCase):
+    QUERIES = [
+        "milk", "mil", "m", "bread eggs", "brea", "egg OR кава", "ка", "café", "caf", "x1", "x10 | to",
+        "milk AND egg", "to_do", "TO_", "zzz", "milk zzz", "zzz OR milk", "OR", "", "!!",
+    ]
+
+    def check_random_changes(self, add, edit, remove, search, seed, ranked=True):
+        rng = random.Random(seed)
+        notes = []
+        for step in range(1200):
+            action = rng.random()
+            if action < 0.5 or not notes:
+                note = Note(" ".join(rng.choices(WORDS, k=rng.randint(1, 6))), rng.sample(WORDS, rng.randint(0, 2)))
+                add(note)
+                notes.append(note)
+            elif action < 0.8:
+                edit(rng.choice(notes), " ".join(rng.choices(WORDS, k=rng.randint(1, 6))), rng.sample(WORDS, 1))
+            else:
+                remove(notes.pop(rng.randrange(len(notes))))
+
+            if step % 40 == 0 and notes:
+                for query in self.QUERIES:
+                    expected = brute_force_scores(notes, query)
+                    found = list(search(query))
+                    self.assertEqual(set(found), set(expected), query)
+                    self.assertEqual(len(found), len(set(found)), query)
+                    if not ranked:
+                        continue
+                    scores = [expected[note] for note in found]
+                    for better, worse in zip(scores, scores[1:]):
+                        self.assertGreaterEqual(better + 1e-9, worse, query)
+        return notes
+
+    def test_matches_a_brute_force_prefix_matcher_through_changes(self):
+        index = NoteIndex()
+
+        def edit(note, text, tags):
+            note.text, note.tags = text, tags
+            index.add(note)
+
+        notes = self.check_random_changes(index.add, edit, index.remove, index.search, seed=22)
+        self.assertEqual(len(index), len(notes))
+
+    def test_sqlite_full_text_search_matches_the_same_notes(self):
+        connection = sqlite3.connect(":memory:")
+        self.addCleanup(connection.close)
+        repository = SQLiteContactRepository(connection)
+        if not repository._note_search:
+            self.skipTest("SQLite is built without FTS5")
+        # FTS5 weighs BM25 per column, so only the matched notes are compared
+        self.check_random_changes(
+            repository.add_note, repository.edit_note, repository.del_note,
+            lambda query: repository.note_matches(query) if query else [], seed=23, ranked=False,
+        )
+
+    def test_equal_scores_keep_add_order(self):
+        notes = [Note("same words here") for _ in range(5)]
+        index = NoteIndex(notes)
+        self.assertEqual(index.search("same"), notes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import sqlite3
+import unittest
+
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+from repositories.sqlite_contact_repository import SQLiteContactRepository
+
+TAGS = ["work", "home", "urgent", "ідея", "a", "b", "zz", "Work"]
+
+
+def brute_force_tag_listing(notes):
+    """The notes-by-tag listing built from scratch: sorted tags, each group in add order."""
+    tags = sorted({tag for note in notes for tag in note.tags})
+    tag_map = {tag: [note for note in notes if tag in note.tags] for tag in tags}
+    untagged = [note for note in notes if not note.tags]
+    return ContactRepository._format_tag_groups(tag_map, untagged)
+
+
+class NoteTagListingTest(unittest.TestCase):
+    def check_random_changes(self, repository, seed):
+        rng = random.Random(seed)
+        notes = []
+        for step in range(1500):
+            action = rng.random()
+            if action < 0.45 or not notes:
+                note = Note(f"note {step}", rng.sample(TAGS, rng.randint(0, 3)))
+                repository.add_note(note)
+                notes.append(note)
+            elif action < 0.75:
+                note = rng.choice(notes)
+                # Empty tags leave them as they were, like note-edit
+                new_tags = rng.sample(TAGS, rng.randint(0, 3))
+                repository.edit_note(note, f"edited {step}" if rng.random() < 0.5 else None, new_tags)
+            else:
+                note = notes.pop(rng.randrange(len(notes)))
+                repository.del_note(note)
+            if step % 25 == 0:
+                self.assertEqual(repository.notes_by_tags(), brute_force_tag_listing(notes), step)
+        self.assertEqual(repository.notes_by_tags(), brute_force_tag_listing(notes))
+
+    def test_in_memory_listing_matches_brute_force(self):
+        self.check_random_changes(ContactRepository(), seed=21)
+
+    def test_sqlite_listing_matches_brute_force(self):
+        connection = sqlite3.connect(":memory:")
+        self.addCleanup(connection.close)
+        self.check_random_changes(SQLiteContactRepository(connection), seed=22)
+
+    def test_listing_of_given_notes_matches_brute_force(self):
+        rng = random.Random(23)
+        repository = ContactRepository()
+        notes = [Note(f"note {i}", rng.sample(TAGS, rng.randint(0, 3))) for i in range(200)]
+        for note in notes:
+            repository.add_note(note)
+        subset = rng.sample(notes, 50)
+        self.assertEqual(repository.notes_by_tags(subset), brute_force_tag_listing(subset))
+
+
+if __name__ == "__main__":
+    unittest.main()